@@ -12,23 +12,27 @@ def find_artist_match(artist_results: dict, artist_name: str) -> dict:
             return artist
     return None
 
-def search_and_extract_artist(artist_name: str) -> dict:
+def artist_record(artist: dict) -> dict:
+    """Convert a full Spotify artist object into an Artist row"""
+    return {
+        'id': artist['id'],
+        'name': artist['name'],
+        'genre': ', '.join(artist['genres']),
+        'popularity': artist['popularity'],
+        'followers': artist['followers']['total'],
+        'spotify_url': artist['external_urls']['spotify'],
+        'image_url': artist['images'][0]['url'] if artist['images'] else None
+    }
+
+def search_and_extract_artist(artist_name: str, extractor: SpotifyDataExtractor = None) -> dict:
     """Search for an artist by name and extract relevant info"""
-    extract = SpotifyDataExtractor()
+    extract = extractor or SpotifyDataExtractor()
     result = extract.search_artist(artist_name)
     if result['artists']['items']:
-        # Check if there are any artist matches 
+        # Check if there are any artist matches
         artist = find_artist_match(result, artist_name)
         if artist:
-            return {
-                'id': artist['id'],
-                'name': artist['name'],
-                'genre': ', '.join(artist['genres']),
-                'popularity': artist['popularity'],
-                'followers': artist['followers']['total'],
-                'spotify_url': artist['external_urls']['spotify'],
-                'image_url': artist['images'][0]['url'] if artist['images'] else None
-            }
+            return artist_record(artist)
         return None
 
 
@@ -38,4 +42,4 @@ def add_artist_not_in_db(artist_name: str, db_manager: DatabaseManager) -> str:
     print(f"Extracted artist info: {result}")
     if result:
         success = db_manager.bulk_insert([result], Artist)
-        return result['id'] if success else None
\ No newline at end of file
+        return result['id'] if success else None
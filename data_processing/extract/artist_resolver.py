@@ -0,0 +1,131 @@
+# data_processing/extract/artist_resolver.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+import requests
+from sqlalchemy.exc import SQLAlchemyError
+from database.engine import max_bind_params, upsert_chunk_size, upsert_insert
+from database.models import Artist, ArtistSearchCache
+from database.db_manager import DatabaseManager
+from data_processing.extract.spotify_extract import SpotifyDataExtractor
+from data_processing.extract.artist_extract import search_and_extract_artist
+from data_processing.transform.utils import clean_artist_name
+from utils.config import ARTIST_SEARCH_NEGATIVE_TTL_DAYS, SPOTIFY_MAX_CONCURRENCY
+from utils.logger import etl_logger
+
+class ArtistResolver:
+    """
+    Resolve many artist names to Spotify IDs at once.
+    Names are deduplicated on clean_artist_name, answered from the persistent
+    artist_search_cache where possible (including cached misses until they
+    expire), and the rest are searched concurrently with one shared extractor.
+    """
+
+    def __init__(self, db_manager: DatabaseManager = None, extractor: SpotifyDataExtractor = None,
+                 negative_ttl: timedelta = None, max_workers: int = None):
+        self.session_factory = (db_manager or DatabaseManager()).session_factory
+        self.extractor = extractor
+        self.negative_ttl = negative_ttl or timedelta(days=ARTIST_SEARCH_NEGATIVE_TTL_DAYS)
+        self.max_workers = max_workers or SPOTIFY_MAX_CONCURRENCY
+
+    def _load_cached(self, cleaned_names: List[str]) -> Dict[str, Optional[str]]:
+        """Cached name -> artist_id entries; expired misses are left out"""
+        negative_cutoff = datetime.now() - self.negative_ttl
+        session = self.session_factory()
+        try:
+            # IN lists stay under the backend's bound-parameter limit
+            chunk_size = max_bind_params(session.get_bind().dialect.name)
+            cached = {}
+            for start in range(0, len(cleaned_names), chunk_size):
+                rows = session.query(ArtistSearchCache)\
+                              .filter(ArtistSearchCache.cleaned_name.in_(cleaned_names[start:start + chunk_size]))\
+                              .all()
+                cached.update(
+                    (row.cleaned_name, row.artist_id)
+                    for row in rows
+                    if row.artist_id or row.searched_at >= negative_cutoff
+                )
+            return cached
+        finally:
+            session.close()
+
+    def _search(self, artist_name: str) -> Optional[Dict]:
+        """Search one name; returns the artist record, None for no match"""
+        return search_and_extract_artist(artist_name, self.extractor)
+
+    @staticmethod
+    def _chunks(table, dialect_name: str, rows: List[Dict]) -> Iterator[List[Dict]]:
+        """Parameter-limit-sized slices of rows for multi-VALUES statements on table"""
+        chunk_size = upsert_chunk_size(table, dialect_name)
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+    def _save(self, records: List[Dict], searched: Dict[str, Optional[str]]) -> None:
+        """Insert resolved artists and cache entries in a single transaction"""
+        now = datetime.now()
+        session = self.session_factory()
+        dialect_name = session.get_bind().dialect.name
+        try:
+            if records:
+                rows = [{**record, 'created_at': now, 'updated_at': now} for record in records]
+                for chunk in self._chunks(Artist.__table__, dialect_name, rows):
+                    stmt = upsert_insert(Artist.__table__, dialect_name).values(chunk)
+                    session.execute(stmt.on_conflict_do_nothing(index_elements=['id']))
+
+            if searched:
+                cache_rows = [
+                    {'cleaned_name': name, 'artist_id': artist_id, 'searched_at': now}
+                    for name, artist_id in searched.items()
+                ]
+                for chunk in self._chunks(ArtistSearchCache.__table__, dialect_name, cache_rows):
+                    stmt = upsert_insert(ArtistSearchCache.__table__, dialect_name).values(chunk)
+                    session.execute(stmt.on_conflict_do_update(
+                        index_elements=['cleaned_name'],
+                        set_={'artist_id': stmt.excluded.artist_id, 'searched_at': stmt.excluded.searched_at}
+                    ))
+
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            etl_logger.error(f"Saving resolved artists failed: {e}")
+            raise
+        finally:
+            session.close()
+
+    def resolve(self, artist_names: List[str]) -> Dict[str, Optional[str]]:
+        """Map each input name to a Spotify artist ID (None when unresolved)"""
+        by_cleaned = {}
+        for name in artist_names:
+            by_cleaned.setdefault(clean_artist_name(name), name)
+
+        resolved = self._load_cached(list(by_cleaned))
+        misses = [cleaned for cleaned in by_cleaned if cleaned not in resolved]
+
+        searched = {}
+        records = []
+        if misses:
+            # Only authenticate when there is something to search for
+            if self.extractor is None:
+                self.extractor = SpotifyDataExtractor()
+
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='artist_search') as executor:
+                futures = {cleaned: executor.submit(self._search, by_cleaned[cleaned]) for cleaned in misses}
+
+            for cleaned, future in futures.items():
+                try:
+                    record = future.result()
+                except requests.exceptions.RequestException as e:
+                    # Transient failures are not cached as misses
+                    etl_logger.warning(f"Artist search failed for '{by_cleaned[cleaned]}': {e}")
+                    continue
+                searched[cleaned] = record['id'] if record else None
+                if record:
+                    records.append(record)
+
+            self._save(records, searched)
+            resolved.update(searched)
+
+        etl_logger.info(f"Resolved {len(by_cleaned)} artist names: {len(by_cleaned) - len(misses)} cached, "
+                        f"{len(records)} found, {len(searched) - len(records)} not found")
+
+        return {name: resolved.get(clean_artist_name(name)) for name in artist_names}
@@ -5,10 +5,11 @@ from urllib.parse import urlencode, urlparse
 from typing import Dict
 import webbrowser
 import time
-import json
 import threading
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from utils.config import SPOTIFY_TOKEN_PATH, SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET
+from utils.config import SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET, SPOTIFY_ACCOUNTS_URL
+from data_processing.extract.http_client import get_http_client
+from data_processing.extract.token_manager import get_token_manager
 
 class OAuthCallbackHandler(BaseHTTPRequestHandler):
     """HTTP handler to capture OAuth callback"""
@@ -57,13 +58,17 @@ class OAuthCallbackServer(HTTPServer):
 
 class SpotifyAuth:
     """Extract your personal Spotify data with automatic authentication """
-    def __init__(self, client_id: str = None, client_secret: str = None, redirect_uri: str = None):
+    def __init__(self, client_id: str = None, client_secret: str = None, redirect_uri: str = None,
+                 accounts_url: str = None):
         self.client_id = client_id or SPOTIFY_CLIENT_ID
         self.client_secret = client_secret or SPOTIFY_CLIENT_SECRET
 
         # Use a valid redirect URI - you MUST register this in your Spotify app settings
         self.redirect_uri = redirect_uri or "http://127.0.0.1:8050/"
-        self.auth_url = "https://accounts.spotify.com/api/token"
+        self.accounts_url = accounts_url or SPOTIFY_ACCOUNTS_URL
+        self.auth_url = f"{self.accounts_url}/api/token"
+        self.http = get_http_client()
+        self.token_manager = get_token_manager()
         
         self.access_token = None
         self.refresh_token = None
@@ -98,7 +103,7 @@ class SpotifyAuth:
             'show_dialog': 'false'
         }
         
-        auth_url = f"https://accounts.spotify.com/authorize?{urlencode(params)}"
+        auth_url = f"{self.accounts_url}/authorize?{urlencode(params)}"
         
         # Parse redirect URI to get port
         redirect_host = 'localhost'
@@ -164,7 +169,7 @@ class SpotifyAuth:
         }
         
         try:
-            response = requests.post(self.auth_url, headers=headers, data=data)
+            response = self.http.post(self.auth_url, headers=headers, data=data)
             response.raise_for_status()
             
             token_data = response.json()
@@ -183,29 +188,35 @@ class SpotifyAuth:
                 print(f"❌ Token exchange failed: {e.response.status_code} - {e.response.text}")
             return False
 
-    def _save_tokens(self) -> None:
-        """Save tokens to file for future use"""
-        token_data = {
+    def _token_state(self) -> Dict:
+        """Current token fields in the token file layout"""
+        return {
             'access_token': self.access_token,
             'refresh_token': self.refresh_token,
-            'token_expires': self.token_expires.isoformat() if self.token_expires else None,
+            'token_expires': self.token_expires,
             'client_id': self.client_id,
             'client_secret': self.client_secret,
             'redirect_uri': self.redirect_uri
         }
-        
-        with open(SPOTIFY_TOKEN_PATH, 'w') as f:
-            json.dump(token_data, f, indent=2)
+
+    def _apply_token_state(self, token_data: Dict) -> None:
+        """Copy token fields from the shared token manager"""
+        self.access_token = token_data['access_token']
+        self.refresh_token = token_data['refresh_token']
+        self.token_expires = token_data['token_expires']
+
+    def _save_tokens(self) -> None:
+        """Save tokens to the shared token manager, which writes the file atomically"""
+        self.token_manager.store(self._token_state(), self._request_token_refresh)
 
     def load_tokens(self) -> bool:
-        """Load tokens from file"""
+        """Load tokens from the shared token manager (the file is read once per process)"""
+        token_data = self.token_manager.load(self._request_token_refresh)
+        if not token_data:
+            return False
+
         try:
-            with open(SPOTIFY_TOKEN_PATH, 'r') as f:
-                token_data = json.load(f)
-            
-            self.access_token = token_data['access_token']
-            self.refresh_token = token_data['refresh_token']
-            self.token_expires = datetime.fromisoformat(token_data['token_expires'])
+            self._apply_token_state(token_data)
             
             # Only use saved client credentials if not provided
             if not self.client_id:
@@ -216,14 +227,11 @@ class SpotifyAuth:
                 self.redirect_uri = token_data['redirect_uri']
             
             return True
-        except (FileNotFoundError, KeyError, ValueError) as e:
+        except KeyError:
             return False
 
-    def _refresh_access_token(self) -> None:
-        """Refresh access token using refresh token"""
-        if not self.refresh_token:
-            raise ValueError("No refresh token available. Please re-authenticate.")
-        
+    def _request_token_refresh(self, refresh_token: str) -> Dict:
+        """POST a refresh_token grant and return the updated token fields"""
         auth_string = f"{self.client_id}:{self.client_secret}"
         auth_bytes = auth_string.encode('utf-8')
         auth_base64 = base64.b64encode(auth_bytes).decode('utf-8')
@@ -235,26 +243,34 @@ class SpotifyAuth:
         
         data = {
             "grant_type": "refresh_token",
-            "refresh_token": self.refresh_token
+            "refresh_token": refresh_token
         }
         
-        response = requests.post(self.auth_url, headers=headers, data=data)
+        response = self.http.post(self.auth_url, headers=headers, data=data)
         response.raise_for_status()
         
         token_data = response.json()
-        self.access_token = token_data['access_token']
-        
         expires_in = token_data.get('expires_in', 3600)
-        self.token_expires = datetime.now() + timedelta(seconds=expires_in - 300)
-        
-        # Save updated tokens
-        self._save_tokens()
+        return {
+            'access_token': token_data['access_token'],
+            # Spotify may rotate the refresh token
+            'refresh_token': token_data.get('refresh_token') or refresh_token,
+            'token_expires': datetime.now() + timedelta(seconds=expires_in - 300)
+        }
+
+    def _refresh_access_token(self) -> None:
+        """Refresh access token using refresh token"""
+        if not self.refresh_token:
+            raise ValueError("No refresh token available. Please re-authenticate.")
+        self.token_manager.adopt(self._token_state())
+        self._apply_token_state(self.token_manager.refresh(self._request_token_refresh))
 
     def get_auth_header(self) -> Dict[str, str]:
-        """Get authorization header for requests"""
-        if not self.access_token or datetime.now() >= self.token_expires:
-            if self.refresh_token:
-                self._refresh_access_token()
-            else:
-                raise ValueError("Not authenticated. Please run automatic_user_authentication() first.")
-        return {"Authorization": f"Bearer {self.access_token}"}
\ No newline at end of file
+        """Get authorization header, served from the in-memory token manager"""
+        if not self.access_token and not self.refresh_token:
+            raise ValueError("Not authenticated. Please run automatic_user_authentication() first.")
+
+        # Tokens set directly on this instance seed the manager if it has none yet
+        self.token_manager.adopt(self._token_state())
+        self._apply_token_state(self.token_manager.get_valid(self._request_token_refresh))
+        return {"Authorization": f"Bearer {self.access_token}"}
@@ -0,0 +1,129 @@
+# data_processing/extract/gazetteer.py
+import csv
+import os
+import re
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from data_processing.extract.geocode_cache import GeocodeCache
+
+INDEX_MAGIC = b'GZIDX1'
+POSTCODE_PATTERN = re.compile(r'\b(\d{5})(?:-\d{4})?\b')
+
+class GazetteerIndex:
+    """
+    Compact in-memory index of postcode and city centroids.
+    Keys are kept sorted in one list and coordinates in a flat array of
+    doubles, so lookups are a binary search with no per-entry objects.
+    """
+
+    def __init__(self, keys: List[str], coords: array):
+        self.keys = keys
+        self.coords = coords
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @staticmethod
+    def city_key(city: str, state: str) -> str:
+        return f"city:{GeocodeCache.normalize(city, state)}"
+
+    @staticmethod
+    def postcode_key(postcode: str) -> str:
+        return f"zip:{postcode}"
+
+    @classmethod
+    def build(cls, csv_path: str) -> 'GazetteerIndex':
+        """Build the index from a postcode,city,state,latitude,longitude CSV"""
+        sums: Dict[str, List[float]] = {}
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    lat, lon = float(row['latitude']), float(row['longitude'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                keys = []
+                if row.get('postcode'):
+                    keys.append(cls.postcode_key(row['postcode'].strip()[:5]))
+                if row.get('city') and row.get('state'):
+                    keys.append(cls.city_key(row['city'], row['state']))
+                for key in keys:
+                    # Cities span many postcodes; index their mean centroid
+                    total = sums.setdefault(key, [0.0, 0.0, 0])
+                    total[0] += lat
+                    total[1] += lon
+                    total[2] += 1
+
+        keys = sorted(sums)
+        coords = array('d')
+        for key in keys:
+            lat_sum, lon_sum, count = sums[key]
+            coords.extend((lat_sum / count, lon_sum / count))
+        return cls(keys, coords)
+
+    def save(self, index_path: str) -> None:
+        """Write the pre-built binary index: header, coordinate array, key blob"""
+        blob = '\n'.join(self.keys).encode('utf-8')
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            f.write(struct.pack('<QQ', len(self.keys), len(blob)))
+            f.write(self.coords.tobytes())
+            f.write(blob)
+        os.replace(tmp_path, index_path)
+
+    @classmethod
+    def read(cls, index_path: str) -> 'GazetteerIndex':
+        """Load a pre-built binary index"""
+        with open(index_path, 'rb') as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(f"Not a gazetteer index: {index_path}")
+            count, blob_size = struct.unpack('<QQ', f.read(16))
+            coords = array('d')
+            coords.frombytes(f.read(count * 2 * coords.itemsize))
+            keys = f.read(blob_size).decode('utf-8').split('\n') if count else []
+        return cls(keys, coords)
+
+    @classmethod
+    def load(cls, csv_path: str) -> 'GazetteerIndex':
+        """Load the binary index next to the CSV, rebuilding it when the CSV is newer"""
+        index_path = f"{os.path.splitext(csv_path)[0]}.idx"
+        if os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(csv_path):
+            return cls.read(index_path)
+        index = cls.build(csv_path)
+        index.save(index_path)
+        return index
+
+    def get(self, key: str) -> Optional[Tuple[float, float]]:
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return self.coords[2 * position], self.coords[2 * position + 1]
+        return None
+
+    def lookup(self, address: str = None, city: str = None,
+               state: str = None) -> Optional[Tuple[Tuple[float, float], str]]:
+        """Resolve by postcode found in the address, then by city/state; returns (coords, strategy)"""
+        if address:
+            match = POSTCODE_PATTERN.search(str(address))
+            if match:
+                coords = self.get(self.postcode_key(match.group(1)))
+                if coords:
+                    return coords, 'gazetteer_postcode'
+        if city and state:
+            coords = self.get(self.city_key(city, state))
+            if coords:
+                return coords, 'gazetteer_city'
+        return None
+
+
+_indexes: Dict[str, GazetteerIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_gazetteer_index(csv_path: str) -> GazetteerIndex:
+    """Return the process-wide index for a gazetteer CSV, loading it once"""
+    with _indexes_lock:
+        if csv_path not in _indexes:
+            _indexes[csv_path] = GazetteerIndex.load(csv_path)
+        return _indexes[csv_path]
@@ -0,0 +1,77 @@
+# data_processing/extract/geocode_cache.py
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional
+from utils.config import GEOCODE_CACHE_PATH, GEOCODE_MISS_TTL_DAYS
+
+class GeocodeCache:
+    """
+    Persistent SQLite cache of venue geocoding results.
+    Stores hits with the fallback strategy that found them, and misses
+    (NULL coordinates) which expire after miss_ttl_days.
+    """
+
+    def __init__(self, db_path: str = None, miss_ttl_days: int = None):
+        self.db_path = db_path or GEOCODE_CACHE_PATH
+        self.miss_ttl = (GEOCODE_MISS_TTL_DAYS if miss_ttl_days is None else miss_ttl_days) * 24 * 3600
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                query TEXT PRIMARY KEY,
+                latitude REAL,
+                longitude REAL,
+                strategy TEXT,
+                cached_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def normalize(*parts: Optional[str]) -> str:
+        """Normalize query parts: fold accents and case, drop punctuation, collapse spaces"""
+        normalized = []
+        for part in parts:
+            if part is None or part != part:  # None or NaN from pandas
+                normalized.append('')
+                continue
+            text = unicodedata.normalize('NFKD', str(part))
+            text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+            text = re.sub(r'[^\w\s]', ' ', text)
+            normalized.append(' '.join(text.split()))
+        return '|'.join(normalized)
+
+    def get(self, query: str) -> Optional[Dict]:
+        """Cached result for a normalized query, or None if unknown or an expired miss"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT latitude, longitude, strategy, cached_at FROM geocode_cache WHERE query = ?",
+                (query,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        latitude, longitude, strategy, cached_at = row
+        if latitude is None and time.time() - cached_at > self.miss_ttl:
+            return None
+        return {'latitude': latitude, 'longitude': longitude, 'strategy': strategy}
+
+    def put(self, query: str, latitude: Optional[float], longitude: Optional[float],
+            strategy: Optional[str] = None) -> None:
+        """Store a hit (with the strategy that found it) or a miss (None coordinates)"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache (query, latitude, longitude, strategy, cached_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (query, latitude, longitude, strategy, time.time())
+            )
+            self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
@@ -1,67 +1,137 @@
 # data_processing/extract/geocoder.py
 import pandas as pd
 from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
 import time
-from typing import Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Tuple, Optional
+from data_processing.extract.geocode_cache import GeocodeCache
+from data_processing.extract.gazetteer import GazetteerIndex, get_gazetteer_index
+from data_processing.extract.rate_limiter import TokenBucket
+from utils.config import GEOCODER_RATE_LIMIT, GEOCODER_MAX_WORKERS, GEOCODER_BACKEND, GAZETTEER_PATH
+from utils.logger import etl_logger
+
+VENUE_COLUMNS = ['venue_name', 'venue_address', 'venue_city', 'venue_state']
 
 class VenueGeocoder:
     """Simple geocoding service for music venues"""
     
-    def __init__(self):
+    def __init__(self, cache: GeocodeCache = None, use_cache: bool = True,
+                 rate_limiter: TokenBucket = None, backend: str = None,
+                 gazetteer: GazetteerIndex = None):
         self.geolocator = Nominatim(user_agent="music_dashboard_app")
+        # Results are remembered between runs so re-imports skip the network
+        self.cache = cache or (GeocodeCache() if use_cache else None)
+        # Shared by all worker threads to respect the provider's request rate
+        self.rate_limiter = rate_limiter or TokenBucket(GEOCODER_RATE_LIMIT, 1)
+
+        # The gazetteer backend answers from a local index before trying Nominatim
+        backend = backend or GEOCODER_BACKEND
+        if backend not in ('nominatim', 'gazetteer'):
+            raise ValueError(f"Unknown geocoder backend: {backend}")
+        if gazetteer is None and backend == 'gazetteer':
+            gazetteer = get_gazetteer_index(GAZETTEER_PATH)
+        self.gazetteer = gazetteer
+    
+    def _strategies(self, venue_name: str, address: str = None,
+                    city: str = None, state: str = None) -> List[Tuple[str, Optional[str]]]:
+        """Fallback query strings, most specific first"""
+        return [
+            ('address', f"{address}, {city}, {state}" if address and city and state else None),
+            ('venue_city_state', f"{venue_name}, {city}, {state}" if city and state else None),
+            ('venue_city', f"{venue_name}, {city}" if city else None),
+            ('venue', venue_name)
+        ]
         
     def geocode_venue(self, venue_name: str, address: str = None, 
                      city: str = None, state: str = None) -> Tuple[Optional[float], Optional[float]]:
         """Geocode a venue with multiple fallback strategies """
-        # Try different address strategies
-        strategies = [
-            f"{address}, {city}, {state}" if address and city and state else None,
-            f"{venue_name}, {city}, {state}" if city and state else None,
-            f"{venue_name}, {city}" if city else None,
-            venue_name
-        ]
+        cache_key = GeocodeCache.normalize(venue_name, address, city, state)
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached:
+                return cached['latitude'], cached['longitude']
+        
+        # Local index first; Nominatim only when it has no match
+        if self.gazetteer:
+            local = self.gazetteer.lookup(address, city, state)
+            if local:
+                coords, strategy = local
+                if self.cache:
+                    self.cache.put(cache_key, coords[0], coords[1], strategy)
+                return coords
         
-        for search_query in strategies:
+        # Try different address strategies
+        had_error = False
+        for strategy, search_query in self._strategies(venue_name, address, city, state):
             if not search_query:
                 continue
                 
             try:
                 coords = self._safe_geocode(search_query)
                 if coords:
+                    if self.cache:
+                        self.cache.put(cache_key, coords[0], coords[1], strategy)
                     return coords
-                    
-                time.sleep(1)  # Rate limiting
                 
             except Exception as e:
                 print(f"Geocoding error for '{search_query}': {e}")
+                had_error = True
                 continue
         
+        # Only remember genuine misses, not failures caused by errors
+        if self.cache and not had_error:
+            self.cache.put(cache_key, None, None)
         return None, None
     
-    def geocode_venue_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Geocode all venues in a DataFrame"""
+    def geocode_venue_dataframe(self, df: pd.DataFrame, max_workers: int = None,
+                                progress_every: int = 25) -> pd.DataFrame:
+        """
+        Geocode all venues in a DataFrame.
+        Rows are deduplicated on the normalized (name, address, city, state),
+        unique venues are geocoded on a rate-limited worker pool, and results
+        are joined back onto every matching row.
+        """
         df = df.copy()
-        df['latitude'] = None
-        df['longitude'] = None
-        
-        for idx, row in df.iterrows():
-            lat, lon = self.geocode_venue(
-                venue_name=row['venue_name'],
-                address=row.get('venue_address'),
-                city=row.get('venue_city'),
-                state=row.get('venue_state')
-            )
-            
-            df.at[idx, 'latitude'] = lat
-            df.at[idx, 'longitude'] = lon
-        
+        max_workers = max_workers or GEOCODER_MAX_WORKERS
+
+        venue_fields = df.reindex(columns=VENUE_COLUMNS)
+        venue_fields = venue_fields.astype(object).where(venue_fields.notna(), None)
+        df['_geo_key'] = [GeocodeCache.normalize(*values) for values in venue_fields.itertuples(index=False)]
+
+        unique_venues = venue_fields.assign(_geo_key=df['_geo_key']).drop_duplicates('_geo_key')
+        total = len(unique_venues)
+        etl_logger.info(f"Geocoding {total} unique venues from {len(df)} rows with {max_workers} workers")
+
+        results = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='geocode') as executor:
+            futures = {
+                executor.submit(
+                    self.geocode_venue,
+                    venue_name=venue.venue_name,
+                    address=venue.venue_address,
+                    city=venue.venue_city,
+                    state=venue.venue_state
+                ): geo_key
+                for geo_key, venue in zip(unique_venues['_geo_key'], unique_venues.itertuples(index=False))
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                lat, lon = future.result()
+                results.append((futures[future], lat, lon))
+                if done % progress_every == 0 or done == total:
+                    elapsed = time.perf_counter() - start
+                    etl_logger.info(f"Geocoded {done}/{total} venues ({done / elapsed:.2f} venues/s)")
+
+        coords = pd.DataFrame(results, columns=['_geo_key', 'latitude', 'longitude'])
+        df = df.drop(columns=['latitude', 'longitude'], errors='ignore')
+        df = df.merge(coords, on='_geo_key', how='left').drop(columns='_geo_key')
+        # The merge turns missing coordinates into NaN; keep them None like geocode_venue
+        for column in ('latitude', 'longitude'):
+            df[column] = df[column].astype(object).where(df[column].notna(), None)
         return df
     
     def _safe_geocode(self, query: str) -> Optional[Tuple[float, float]]:
-        """Safe geocoding with error handling"""
-        try:
-            location = self.geolocator.geocode(query)
-            return (location.latitude, location.longitude) if location else None
-        except GeocoderTimedOut:
-            return None
\ No newline at end of file
+        """Rate-limited lookup; timeouts propagate so they are not cached as misses"""
+        self.rate_limiter.acquire()
+        location = self.geolocator.geocode(query)
+        return (location.latitude, location.longitude) if location else None
\ No newline at end of file
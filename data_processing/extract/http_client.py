@@ -0,0 +1,56 @@
+# data_processing/extract/http_client.py
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional, Tuple
+from utils.config import HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+
+class HttpClient:
+    """Pooled, keep-alive HTTP client shared by the Spotify extract layer"""
+
+    def __init__(self, pool_size: int = None, timeout: Tuple[float, float] = None):
+        self.pool_size = pool_size or HTTP_POOL_SIZE
+        self.timeout = timeout or (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+        # One session keeps TCP/TLS connections alive between calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            pool_block=True
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+
+    def get(self, url: str, params: Dict = None, headers: Dict = None,
+            timeout: Tuple[float, float] = None) -> requests.Response:
+        """Send a GET request over the pooled session"""
+        return self.session.get(url, params=params, headers=headers,
+                                timeout=timeout or self.timeout)
+
+    def post(self, url: str, data: Dict = None, headers: Dict = None,
+             timeout: Tuple[float, float] = None) -> requests.Response:
+        """Send a POST request over the pooled session"""
+        return self.session.post(url, data=data, headers=headers,
+                                 timeout=timeout or self.timeout)
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        self.session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide pooled HTTP client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
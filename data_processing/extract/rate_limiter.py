@@ -0,0 +1,147 @@
+# data_processing/extract/rate_limiter.py
+import random
+import threading
+import time
+import requests
+from typing import Callable, Dict, Optional
+from utils.config import (
+    SPOTIFY_RATE_LIMIT, SPOTIFY_RATE_BURST, SPOTIFY_MAX_RETRIES,
+    SPOTIFY_BACKOFF_BASE, SPOTIFY_BACKOFF_MAX
+)
+from utils.logger import etl_logger
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every caller of an API"""
+
+    def __init__(self, rate: float, capacity: int = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    # No tokens accrue while paused
+                    self.updated = now
+                    delay = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for a while (e.g. after a 429)"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+class RequestScheduler:
+    """Runs HTTP calls through a token bucket, honouring Retry-After and retrying 5xx"""
+
+    def __init__(self, bucket: TokenBucket = None, max_retries: int = None,
+                 backoff_base: float = None, backoff_max: float = None):
+        self.bucket = bucket or TokenBucket(SPOTIFY_RATE_LIMIT, SPOTIFY_RATE_BURST)
+        self.max_retries = SPOTIFY_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base or SPOTIFY_BACKOFF_BASE
+        self.backoff_max = backoff_max or SPOTIFY_BACKOFF_MAX
+        self.stats = {'requests': 0, 'throttled': 0, 'retried': 0, 'failed': 0}
+        self.stats_lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Snapshot of request/throttle/retry counters"""
+        with self.stats_lock:
+            return dict(self.stats)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait from the Retry-After header, falling back to backoff"""
+        value = response.headers.get('Retry-After')
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return self._backoff(attempt)
+
+    def execute(self, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Send a request, retrying throttled (429) and server error (5xx) responses.
+        The last response is returned once retries are exhausted so the caller
+        can raise_for_status() as usual.
+        """
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            self._count('requests')
+
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    self._count('failed')
+                    raise
+                delay = self._backoff(attempt)
+                etl_logger.warning(f"Request error ({e}); retrying in {delay:.2f}s")
+                self._count('retried')
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.status_code == 429:
+                self._count('throttled')
+                if attempt >= self.max_retries:
+                    self._count('failed')
+                    return response
+                delay = self._retry_after(response, attempt)
+                etl_logger.warning(f"Rate limited by Spotify; pausing all requests for {delay:.2f}s")
+                # Pausing the shared bucket holds back every other thread too
+                self.bucket.pause(delay)
+                attempt += 1
+                continue
+
+            if response.status_code >= 500:
+                if attempt >= self.max_retries:
+                    self._count('failed')
+                    return response
+                delay = self._backoff(attempt)
+                etl_logger.warning(f"Spotify returned {response.status_code}; retrying in {delay:.2f}s")
+                self._count('retried')
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            return response
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_request_scheduler() -> RequestScheduler:
+    """Return the process-wide Spotify request scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RequestScheduler()
+    return _scheduler
@@ -0,0 +1,89 @@
+# data_processing/extract/response_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+from utils.config import SPOTIFY_CACHE_DIR, SPOTIFY_CACHE_TTL, SPOTIFY_CACHE_MAX_BYTES
+
+class ResponseCache:
+    """
+    On-disk cache of JSON API responses keyed by URL + params.
+    Entries keep their ETag for conditional requests; the directory is kept
+    under max_bytes by evicting least recently used entries.
+    """
+
+    def __init__(self, cache_dir: str = None, ttl: int = None, max_bytes: int = None,
+                 offline: bool = False):
+        self.cache_dir = cache_dir or SPOTIFY_CACHE_DIR
+        self.ttl = SPOTIFY_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = max_bytes or SPOTIFY_CACHE_MAX_BYTES
+        self.offline = offline
+        self.lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.size = sum(os.path.getsize(path) for path in self._entry_paths())
+
+    def _entry_paths(self):
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith('.json')
+        ]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def make_key(url: str, params: Dict = None) -> str:
+        """Stable cache key for an endpoint and its query parameters"""
+        raw = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry (body, etag, stored_at) or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used for LRU eviction
+            return entry
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """True while the entry is within its TTL"""
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def put(self, key: str, body: Dict, etag: str = None) -> None:
+        """Store a response body atomically, then evict if over budget"""
+        entry = {'etag': etag, 'stored_at': time.time(), 'body': body}
+        path = self._path(key)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+
+        with self.lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self.size += os.path.getsize(path) - old_size
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(
+            (os.path.getmtime(path), os.path.getsize(path), path) for path in self._entry_paths()
+        )
+        self.size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.size -= size
+            except FileNotFoundError:
+                continue
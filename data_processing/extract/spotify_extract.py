@@ -1,87 +1,275 @@
 # extract/spotify_extract.py
-import requests
-from typing import Dict, List
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Set, Tuple
 from data_processing.extract.auth import SpotifyAuth
+from data_processing.extract.http_client import get_http_client
+from data_processing.extract.rate_limiter import get_request_scheduler
+from data_processing.extract.response_cache import ResponseCache
+from utils.config import SPOTIFY_API_BASE_URL, SPOTIFY_EXTRACT_MODE, SPOTIFY_MAX_CONCURRENCY, SPOTIFY_CACHE_MODE
+from utils.logger import etl_logger
 
 class SpotifyDataExtractor:
     """Class to extract Spotify user data using SpotifyAuth"""
 
-    def __init__(self):
-        self.auth = SpotifyAuth()
-        self.base_url = "https://api.spotify.com/v1"
+    def __init__(self, cache: ResponseCache = None, auth: SpotifyAuth = None, base_url: str = None):
+        self.auth = auth or SpotifyAuth()
+        self.base_url = base_url or SPOTIFY_API_BASE_URL
+        self.http = get_http_client()
+        self.scheduler = get_request_scheduler()
+
+        # Optional response cache; offline mode replays it without touching the API
+        if cache is None and SPOTIFY_CACHE_MODE in ('on', 'offline'):
+            cache = ResponseCache(offline=SPOTIFY_CACHE_MODE == 'offline')
+        self.cache = cache
+        if self.cache and self.cache.offline:
+            return
+
         # Try to load tokens, if not authenticated, run automatic authentication
-        if not self.auth.load_tokens():
+        if not self.auth.access_token and not self.auth.load_tokens():
             print("No valid tokens found. Starting authentication...")
             success = self.auth.automatic_user_authentication()
             if not success:
                 raise ValueError("Spotify authentication failed. Cannot proceed.")
 
     def make_spotify_request(self, endpoint: str, params: Dict = None):
-        """Make authenticated request to Spotify API"""
+        """Make authenticated request to Spotify API (endpoint may be an absolute `next` URL)"""
         
-        headers = {
-            **self.auth.get_auth_header(),
-            "Content-Type": "application/json"
-        }
-        print(headers)
+        url = endpoint if endpoint.startswith('http') else f"{self.base_url}{endpoint}"
+
+        cache_key = ResponseCache.make_key(url, params) if self.cache else None
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached and (self.cache.offline or self.cache.is_fresh(cached)):
+            return cached['body']
+        if self.cache and self.cache.offline:
+            raise ValueError(f"No cached response for {url} in offline mode")
+
+        def send():
+            # Build headers per attempt so retries pick up a refreshed token
+            headers = {
+                **self.auth.get_auth_header(),
+                "Content-Type": "application/json"
+            }
+            if cached and cached.get('etag'):
+                headers["If-None-Match"] = cached['etag']
+            return self.http.get(url, headers=headers, params=params)
+
+        response = self.scheduler.execute(send)
+
+        # Not modified: the stale cached body is still current
+        if response.status_code == 304 and cached:
+            self.cache.put(cache_key, cached['body'], cached.get('etag'))
+            return cached['body']
 
-        response = requests.get(f"{self.base_url}{endpoint}", headers=headers, params=params)
         response.raise_for_status()
-        
-        return response.json()
+        body = response.json()
+
+        if self.cache:
+            self.cache.put(cache_key, body, response.headers.get('ETag'))
+        return body
     
     def search_artist(self, artist_name: str) -> Dict:
         """Search for an artist by name"""
         params = {'q': artist_name, 'type': 'artist', 'limit': 10}
         return self.make_spotify_request("/search", params)
     
-    def extract_all_data(self, time_ranges: List[str] = None) -> Dict:
+    def _get_page(self, endpoint: str, params: Dict = None, container: str = None) -> Dict:
+        """Fetch one page, unwrapping the paging object when it is nested (e.g. search)"""
+        page = self.make_spotify_request(endpoint, params)
+        return page[container] if container else page
+
+    def paginate(self, endpoint: str, params: Dict = None, container: str = None,
+                 max_items: int = None, prefetch: bool = False) -> Iterator[Dict]:
+        """
+        Lazily yield items from a paged endpoint, following `next` links
+        (offset and cursor based alike). With prefetch, page N+1 is fetched
+        in the background while page N is being consumed.
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='spotify_prefetch') if prefetch else None
+        pending = None
+        yielded = 0
+
+        try:
+            page = self._get_page(endpoint, params, container)
+            while page:
+                next_url = page.get('next')
+                if executor and next_url:
+                    pending = executor.submit(self._get_page, next_url, None, container)
+
+                for item in page.get('items', []):
+                    if max_items is not None and yielded >= max_items:
+                        return
+                    yield item
+                    yielded += 1
+
+                if not next_url:
+                    return
+                page = pending.result() if pending else self._get_page(next_url, None, container)
+                pending = None
+        finally:
+            if executor:
+                if pending:
+                    pending.cancel()
+                executor.shutdown(wait=False)
+
+    def _fetch_items(self, endpoint: str, params: Dict = None) -> List[Dict]:
+        """Fetch every page of an endpoint and return its items"""
+        return list(self.paginate(endpoint, params))
+
+    def iter_saved_tracks(self) -> Iterator[Dict]:
+        """Stream the full saved library, unwrapping the saved-track envelope"""
+        for item in self.paginate("/me/tracks", {'limit': 50}, prefetch=True):
+            yield item['track']
+
+    def _fetch_saved_tracks(self) -> List[Dict]:
+        """Fetch the full saved library"""
+        return list(self.iter_saved_tracks())
+
+    def iter_recently_played(self, played_after: datetime = None) -> Iterator[Dict]:
+        """
+        Stream recently played tracks page by page. With played_after (the latest
+        play already stored), only newer plays are fetched via the `after` cursor,
+        paging until caught up; each play is yielded once, in page order.
+        """
+        if played_after is None:
+            yield from self.paginate("/me/player/recently-played", {'limit': 50})
+            return
+
+        # Stored timestamps are naive UTC
+        if played_after.tzinfo is None:
+            played_after = played_after.replace(tzinfo=timezone.utc)
+        cursor = int(played_after.timestamp() * 1000)
+
+        seen = set()
+        while True:
+            page = self.make_spotify_request(
+                "/me/player/recently-played",
+                {'limit': 50, 'after': cursor}
+            )
+            for item in page.get('items', []):
+                played_at = datetime.fromisoformat(item['played_at'].replace('Z', '+00:00'))
+                if played_at > played_after and item['played_at'] not in seen:
+                    seen.add(item['played_at'])
+                    yield item
+
+            next_cursor = (page.get('cursors') or {}).get('after')
+            if not page.get('items') or not next_cursor or int(next_cursor) <= cursor:
+                break
+            cursor = int(next_cursor)
+
+    def extract_recently_played(self, played_after: datetime = None) -> List[Dict]:
+        """Fetch recently played tracks (see iter_recently_played), newest first like the unfiltered endpoint"""
+        plays = list(self.iter_recently_played(played_after))
+        if played_after is None:
+            return plays
+        return sorted(plays, key=lambda item: item['played_at'], reverse=True)
+
+    def get_artists(self, artist_ids: List[str]) -> List[Dict]:
+        """Fetch full artist objects through the multi-ID endpoint, 50 per request"""
+        artists = []
+        for start in range(0, len(artist_ids), 50):
+            batch = artist_ids[start:start + 50]
+            response = self.make_spotify_request("/artists", {'ids': ','.join(batch)})
+            artists.extend(artist for artist in response['artists'] if artist)
+        return artists
+
+    def hydrate_artists(self, raw_data: Dict, fresh_artist_ids: Set[str] = None) -> List[Dict]:
+        """
+        Fetch full details for artists that only appear as simplified objects
+        (in top tracks, recently played and saved tracks). Artists already
+        present in top artists or listed in fresh_artist_ids are skipped.
+        """
+        skip = {artist['id'] for artist in raw_data.get('top_artists', [])}
+        skip.update(fresh_artist_ids or ())
+
+        tracks = raw_data.get('top_tracks', []) + raw_data.get('saved_tracks', [])
+        tracks += [item['track'] for item in raw_data.get('recently_played', [])]
+
+        missing = []
+        for track in tracks:
+            for artist in track['artists']:
+                if artist['id'] not in skip:
+                    skip.add(artist['id'])
+                    missing.append(artist['id'])
+
+        artists = self.get_artists(missing)
+        etl_logger.info(f"Hydrated {len(artists)} artists in {(len(missing) + 49) // 50} requests")
+        return artists
+
+    def _build_extraction_jobs(self, time_ranges: List[str], played_after: datetime = None,
+                               include_history: bool = True) -> Dict[Tuple, Callable[[], Any]]:
+        """Map each independent endpoint call to a zero-argument callable"""
+        jobs = {('profile',): partial(self.make_spotify_request, "/me")}
+
+        for time_range in time_ranges:
+            params = {'limit': 50, 'time_range': time_range}
+            jobs[('top_tracks', time_range)] = partial(self._fetch_items, "/me/top/tracks", params)
+            jobs[('top_artists', time_range)] = partial(self._fetch_items, "/me/top/artists", params)
+
+        if include_history:
+            jobs[('recently_played',)] = partial(self.extract_recently_played, played_after)
+            jobs[('saved_tracks',)] = self._fetch_saved_tracks
+        return jobs
+
+    def _run_jobs_concurrently(self, jobs: Dict[Tuple, Callable], max_workers: int) -> Dict[Tuple, Any]:
+        """Run extraction jobs on a bounded thread pool"""
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='spotify_extract') as executor:
+            futures = {executor.submit(job): key for key, job in jobs.items()}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+
+    def extract_all_data(self, time_ranges: List[str] = None, mode: str = None,
+                         max_workers: int = None, played_after: datetime = None,
+                         fresh_artist_ids: Set[str] = None, include_history: bool = True) -> Dict:
         """
         Extract all Spotify data for transformation
+        mode is 'sequential' or 'concurrent'; both return the same raw_data shape.
+        played_after limits recently played to plays newer than the stored high-water mark.
+        fresh_artist_ids are excluded from the batched artist hydration stage.
+        include_history=False leaves recently played and saved tracks to the streaming pipeline.
         """
         if time_ranges is None:
             time_ranges = ['short_term', 'medium_term', 'long_term']
-        
-        data = {}
-        
+        mode = mode or SPOTIFY_EXTRACT_MODE
+        max_workers = max_workers or SPOTIFY_MAX_CONCURRENCY
+
+        if mode not in ('sequential', 'concurrent'):
+            raise ValueError(f"Unknown extraction mode: {mode}")
+
         try:
-            # User profile
-            data['profile'] = self.make_spotify_request("/me")
-            
-            # Top tracks for each time range
-            data['top_tracks'] = []
-            for time_range in time_ranges:
-                tracks = self.make_spotify_request(
-                    "/me/top/tracks", 
-                    {'limit': 50, 'time_range': time_range}
-                )['items']
-                data['top_tracks'].extend(tracks)
-            
-            # Top artists for each time range
-            data['top_artists'] = []
+            jobs = self._build_extraction_jobs(time_ranges, played_after, include_history)
+            start = time.perf_counter()
+
+            if mode == 'concurrent':
+                results = self._run_jobs_concurrently(jobs, max_workers)
+            else:
+                results = {key: job() for key, job in jobs.items()}
+
+            etl_logger.info(f"Extracted {len(jobs)} endpoints in {mode} mode "
+                            f"in {time.perf_counter() - start:.2f}s")
+
+            # Reassemble in time range order so rankings match sequential mode
+            data = {
+                'profile': results[('profile',)],
+                'top_tracks': [],
+                'top_artists': []
+            }
+            if include_history:
+                data['recently_played'] = results[('recently_played',)]
+                data['saved_tracks'] = results[('saved_tracks',)]
             for time_range in time_ranges:
-                artists = self.make_spotify_request(
-                    "/me/top/artists",
-                    {'limit': 50, 'time_range': time_range}
-                )['items']
-                data['top_artists'].extend(artists)
-            
-            # Recently played
-            recently_played = self.make_spotify_request(
-                "/me/player/recently-played",
-                {'limit': 50}
-            )
-            data['recently_played'] = recently_played['items']
-            
-            # Saved tracks
-            saved_tracks = self.make_spotify_request(
-                "/me/tracks",
-                {'limit': 50}
-            )
-            data['saved_tracks'] = [item['track'] for item in saved_tracks['items']]
-            
+                data['top_tracks'].extend(results[('top_tracks', time_range)])
+                data['top_artists'].extend(results[('top_artists', time_range)])
+
+            # Full details for artists only seen as simplified objects
+            data['artists'] = self.hydrate_artists(data, fresh_artist_ids)
+
             return data
             
         except Exception as e:
             print(f"Extraction error: {e}")
-            raise
\ No newline at end of file
+            raise
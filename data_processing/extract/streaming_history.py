@@ -0,0 +1,61 @@
+# data_processing/extract/streaming_history.py
+import glob
+import json
+import os
+import re
+from typing import Dict, Iterator, List
+
+# Extended streaming history exports (current and pre-2023 file names)
+HISTORY_FILE_PATTERNS = ('Streaming_History_Audio_*.json', 'endsong_*.json')
+
+_decoder = json.JSONDecoder()
+_SEPARATORS = re.compile(r'[\s,]*')
+
+def history_files(export_dir: str) -> List[str]:
+    """Audio history files in an export directory, in export order"""
+    paths = set()
+    for pattern in HISTORY_FILE_PATTERNS:
+        paths.update(glob.glob(os.path.join(export_dir, pattern)))
+    return sorted(paths)
+
+def iter_json_array(path: str, chunk_size: int = 1 << 20) -> Iterator[Dict]:
+    """
+    Yield the elements of a top-level JSON array one at a time,
+    reading the file in chunks instead of loading it whole.
+    """
+    with open(path, encoding='utf-8-sig') as f:
+        buffer, pos, eof = '', 0, False
+        started = False
+
+        while True:
+            pos = _SEPARATORS.match(buffer, pos).end()
+            if pos >= len(buffer) and not eof:
+                buffer, pos = f.read(chunk_size), 0
+                eof = not buffer
+                continue
+            if pos >= len(buffer):
+                raise ValueError(f"Unexpected end of history file: {path}")
+
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError(f"Expected a JSON array in {path}")
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == ']':
+                return
+
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                item, end = None, None
+            # Incomplete element at the end of the buffer: read more and retry
+            if end is None or (end >= len(buffer) and not eof):
+                if eof:
+                    raise ValueError(f"Malformed JSON in {path} at offset {pos}")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            yield item
+            pos = end
@@ -0,0 +1,172 @@
+# data_processing/extract/token_manager.py
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from utils.config import SPOTIFY_TOKEN_PATH, SPOTIFY_TOKEN_REFRESH_MARGIN
+from utils.logger import etl_logger
+
+class _RefreshFlight:
+    """A refresh in progress; followers wait on it instead of refreshing again"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[Exception] = None
+
+
+class TokenManager:
+    """
+    Process-wide, in-memory holder of the Spotify token for one token file.
+    The file is read once, refreshes are single-flight (concurrent callers
+    wait for the one in progress), a background timer refreshes the token
+    before it expires, and the file is rewritten atomically.
+    """
+
+    def __init__(self, token_path: str = None, refresh_margin: int = None):
+        self.token_path = token_path or SPOTIFY_TOKEN_PATH
+        self.refresh_margin = timedelta(
+            seconds=SPOTIFY_TOKEN_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        )
+        self.state: Optional[Dict] = None
+        self.loaded = False
+        self.flight: Optional[_RefreshFlight] = None
+        self.refresh_fn: Optional[Callable[[str], Dict]] = None
+        self.timer: Optional[threading.Timer] = None
+        self.lock = threading.Lock()
+
+    def load(self, refresh_fn: Callable[[str], Dict] = None) -> Optional[Dict]:
+        """Return the token state, reading the token file only on first use"""
+        with self.lock:
+            if refresh_fn:
+                self.refresh_fn = refresh_fn
+            if not self.loaded:
+                self.loaded = True
+                try:
+                    with open(self.token_path, 'r') as f:
+                        token_data = json.load(f)
+                    token_data['token_expires'] = datetime.fromisoformat(token_data['token_expires'])
+                    self.state = token_data
+                except (FileNotFoundError, KeyError, TypeError, ValueError):
+                    self.state = None
+            state = dict(self.state) if self.state else None
+        if state and not self.timer:
+            self._schedule_refresh()
+        return state
+
+    def adopt(self, state: Dict) -> None:
+        """Use a token obtained elsewhere without writing it to disk"""
+        with self.lock:
+            if self.state is None:
+                self.state = dict(state)
+                self.loaded = True
+
+    def store(self, state: Dict, refresh_fn: Callable[[str], Dict] = None) -> None:
+        """Replace the token in memory and on disk, then schedule a proactive refresh"""
+        with self.lock:
+            self.state = dict(state)
+            self.loaded = True
+            if refresh_fn:
+                self.refresh_fn = refresh_fn
+            self._write(self.state)
+        self._schedule_refresh()
+
+    def _write(self, state: Dict) -> None:
+        """Write the token file atomically so readers never see a partial file"""
+        token_data = {
+            **state,
+            'token_expires': state['token_expires'].isoformat() if state.get('token_expires') else None
+        }
+        token_dir = os.path.dirname(self.token_path)
+        fd, tmp_path = tempfile.mkstemp(dir=token_dir, prefix='.spotify_token', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(token_data, f, indent=2)
+            os.replace(tmp_path, self.token_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _is_valid(self, state: Optional[Dict]) -> bool:
+        return bool(state and state.get('access_token') and state.get('token_expires')
+                    and datetime.now() < state['token_expires'])
+
+    def get_valid(self, refresh_fn: Callable[[str], Dict]) -> Dict:
+        """Return a usable token, refreshing (once, for all callers) if it has expired"""
+        with self.lock:
+            state = self.state
+        if self._is_valid(state):
+            return dict(state)
+        # Re-checked under the lock: a refresh that finished since we looked is reused
+        return self.refresh(refresh_fn, force=False)
+
+    def refresh(self, refresh_fn: Callable[[str], Dict] = None, force: bool = True) -> Dict:
+        """
+        Refresh the token. Only one refresh runs at a time; callers arriving
+        while it is in flight wait for its result instead of posting again.
+        """
+        with self.lock:
+            if refresh_fn:
+                self.refresh_fn = refresh_fn
+            if self.flight:
+                flight, leader = self.flight, False
+            elif not force and self._is_valid(self.state):
+                return dict(self.state)
+            else:
+                flight, leader = _RefreshFlight(), True
+                self.flight = flight
+                refresh_token = (self.state or {}).get('refresh_token')
+                refresh_fn = self.refresh_fn
+
+        if not leader:
+            flight.done.wait()
+            if flight.error:
+                raise flight.error
+            with self.lock:
+                return dict(self.state)
+
+        try:
+            if not refresh_token or not refresh_fn:
+                raise ValueError("No refresh token available. Please re-authenticate.")
+            new_state = {**(self.state or {}), **refresh_fn(refresh_token)}
+            self.store(new_state)
+            return dict(new_state)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self.flight = None
+            flight.done.set()
+
+    def _schedule_refresh(self) -> None:
+        """Start a daemon timer that refreshes shortly before the token expires"""
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+            if not self.state or not self.state.get('token_expires') or not self.refresh_fn:
+                return
+            delay = (self.state['token_expires'] - self.refresh_margin - datetime.now()).total_seconds()
+            self.timer = threading.Timer(max(delay, 0), self._background_refresh)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            # The request path will retry once the token actually expires
+            etl_logger.warning(f"Background token refresh failed: {e}")
+
+
+_managers: Dict[str, TokenManager] = {}
+_managers_lock = threading.Lock()
+
+def get_token_manager(token_path: str = None) -> TokenManager:
+    """Return the process-wide token manager for a token file"""
+    token_path = token_path or SPOTIFY_TOKEN_PATH
+    with _managers_lock:
+        if token_path not in _managers:
+            _managers[token_path] = TokenManager(token_path)
+        return _managers[token_path]
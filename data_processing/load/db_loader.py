@@ -1,50 +1,49 @@
 # load/database_loader_bulk.py
-from sqlalchemy.dialects.sqlite import insert as sqlite_upsert
-import os
-from typing import Dict, List
-from sqlalchemy import create_engine, and_
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Set, Tuple
+import pandas as pd
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.sql.dml import Insert
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
+from utils.config import ARTIST_FRESHNESS_HOURS, DB_URL, PG_COPY_MIN_ROWS
 from utils.logger import etl_logger
 
 # Import your SQLAlchemy models
 from database.models import Artist, TopTrack, TopArtist, ListeningHistory
-from database.db import Base
+from database.engine import get_engine, max_bind_params, upsert_chunk_size, upsert_insert
+from database.migrations import run_migrations
+from data_processing.load.pg_copy import stage_rows
+from data_processing.transform.utils import normalize_artist_name, utc_naive
 
 class DatabaseLoader:
     def __init__(self, db_url: str = None):
-        if db_url is None:
-            db_path = "../database/data.db"
-            os.makedirs(os.path.dirname(db_path), exist_ok=True)
-            db_url = f"sqlite:///{db_path}"
-
-        self.engine = create_engine(db_url)
+        self.engine = get_engine(db_url or DB_URL)
         self.Session = sessionmaker(bind=self.engine)
-        Base.metadata.create_all(bind=self.engine)
+        # PostgreSQL batches at least this large go through COPY and a staging table
+        self.copy_min_rows = PG_COPY_MIN_ROWS
+        run_migrations(self.engine)
     
-    def load_spotify_data(self, transformed_data: Dict):
-        """Load data using bulk operations"""
+    def load_spotify_data(self, transformed_data: Dict) -> Dict:
+        """Load data using bulk operations; returns artist upsert counts and new rows per table"""
         session = self.Session()
+        stats = {}
         
         try:
             # Bulk upsert artists
-            if transformed_data['artists']:
-                self._bulk_upsert_artists(session, transformed_data['artists'])
-            
-            # Bulk insert top tracks (no conflicts expected due to historical nature)
-            if transformed_data['top_tracks']:
-                session.bulk_insert_mappings(TopTrack, transformed_data['top_tracks'])
-            
-            # Bulk insert top artists
-            if transformed_data['top_artists']:
-                session.bulk_insert_mappings(TopArtist, transformed_data['top_artists'])
+            if transformed_data.get('artists'):
+                stats['artists'] = self._bulk_upsert_artists(session, self._utc_naive_rows(transformed_data['artists']))
             
-            # Bulk insert listening history
-            if transformed_data['listening_history']:
-                session.bulk_insert_mappings(ListeningHistory, transformed_data['listening_history'])
+            # Rankings and plays are append-only; rows already stored under their
+            # natural key (from overlapping runs or task retries) are skipped
+            for key, model in (('top_tracks', TopTrack), ('top_artists', TopArtist),
+                               ('listening_history', ListeningHistory)):
+                if transformed_data.get(key):
+                    stats[key] = self._insert_new(session, model, self._utc_naive_rows(transformed_data[key]))
             
             session.commit()
             etl_logger.info("Successfully loaded all Spotify data using bulk operations")
+            return stats
             
         except SQLAlchemyError as e:
             session.rollback()
@@ -53,25 +52,207 @@ class DatabaseLoader:
         finally:
             session.close()
     
-    def _bulk_upsert_artists(self, session, artists: List[Dict]):
-        """Bulk upsert artists using SQLAlchemy Core for better performance"""
-        if not artists:
-            return
+    def load_spotify_frames(self, frames: Dict[str, pd.DataFrame], chunk_size: int = 5000) -> Dict:
+        """Load the columnar transform output in chunks; returns the same stats as load_spotify_data"""
+        session = self.Session()
+        stats = {}
         
-        # For SQLite, we can use INSERT ... ON CONFLICT
-        stmt = sqlite_upsert(Artist.__table__).values(artists)
+        try:
+            for chunk in self._frame_chunks(frames.get('artists'), chunk_size):
+                counts = self._bulk_upsert_artists(session, chunk)
+                totals = stats.setdefault('artists', {'inserted': 0, 'updated': 0, 'unchanged': 0, 'chunks': []})
+                for key in ('inserted', 'updated', 'unchanged'):
+                    totals[key] += counts[key]
+                totals['chunks'].extend(counts['chunks'])
+            
+            for key, model in (('top_tracks', TopTrack), ('top_artists', TopArtist),
+                               ('listening_history', ListeningHistory)):
+                for chunk in self._frame_chunks(frames.get(key), chunk_size):
+                    if self.engine.dialect.name == 'sqlite':
+                        # Core executemany: compiled once, no ORM bookkeeping per row
+                        stmt = self._insert(model.__table__).on_conflict_do_nothing()
+                        inserted = session.execute(stmt, chunk).rowcount
+                    else:
+                        inserted = self._insert_new(session, model, chunk)
+                    stats[key] = stats.get(key, 0) + inserted
+            
+            session.commit()
+            etl_logger.info("Successfully loaded all Spotify frames")
+            return stats
+            
+        except SQLAlchemyError as e:
+            session.rollback()
+            etl_logger.error(f"Columnar database loading error: {e}")
+            raise
+        finally:
+            session.close()
+    
+    def existing_play_keys(self, start: datetime, end: datetime) -> Set[Tuple[str, datetime]]:
+        """
+        (track_id, played_at) pairs stored in the seconds from start to end,
+        naive UTC truncated to the second (plays loaded before truncation
+        still carry milliseconds)
+        """
+        session = self.Session()
+        try:
+            rows = session.query(ListeningHistory.track_id, ListeningHistory.played_at).filter(
+                ListeningHistory.played_at >= start,
+                ListeningHistory.played_at < end + timedelta(seconds=1)
+            ).all()
+            return {(track_id, played_at.replace(tzinfo=None, microsecond=0)) for track_id, played_at in rows}
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _utc_naive_rows(rows: List[Dict]) -> List[Dict]:
+        """
+        Rows with tz-aware datetimes shifted to naive UTC. The DateTime columns
+        are naive: PostgreSQL would convert a bound timestamptz to the session
+        TimeZone but drop the offset from COPY text, so both paths get UTC.
+        """
+        return [
+            {key: utc_naive(value) if isinstance(value, datetime) else value for key, value in row.items()}
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _frame_chunks(frame: pd.DataFrame, chunk_size: int) -> Iterator[List[Dict]]:
+        """Yield DB-ready parameter lists from a frame, chunk by chunk (NaN/NA -> None, naive UTC datetimes)"""
+        if frame is None or frame.empty:
+            return
+        frame = frame.assign(**{
+            column: frame[column].dt.tz_convert('UTC').dt.tz_localize(None)
+            for column in frame.columns if isinstance(frame[column].dtype, pd.DatetimeTZDtype)
+        })
+        for start in range(0, len(frame), chunk_size):
+            chunk = frame.iloc[start:start + chunk_size].astype(object)
+            yield chunk.where(chunk.notna(), None).to_dict(orient='records')
+    
+    def _insert(self, table) -> Insert:
+        """INSERT with ON CONFLICT support for the connected backend"""
+        return upsert_insert(table, self.engine.dialect.name)
+    
+    def _use_copy(self, rows: List[Dict]) -> bool:
+        return self.engine.dialect.name == 'postgresql' and len(rows) >= self.copy_min_rows
+    
+    def _max_bind_params(self) -> int:
+        """Bound-parameter limit of the connected database"""
+        return max_bind_params(self.engine.dialect.name)
+    
+    def _upsert_chunk_size(self, table) -> int:
+        """Rows per multi-VALUES statement that stay under the parameter limit"""
+        return upsert_chunk_size(table, self.engine.dialect.name)
+    
+    def _insert_new(self, session, model, rows: List[Dict]) -> int:
+        """INSERT ... ON CONFLICT DO NOTHING in parameter-limit-sized chunks (or one COPY merge); returns rows inserted"""
+        table = model.__table__
+        if self._use_copy(rows):
+            inserted = self._copy_insert_new(session, table, rows)
+        else:
+            chunk_size = self._upsert_chunk_size(table)
+            inserted = 0
+            for start in range(0, len(rows), chunk_size):
+                stmt = self._insert(table).values(rows[start:start + chunk_size]).on_conflict_do_nothing()
+                inserted += session.execute(stmt).rowcount
+        if inserted < len(rows):
+            etl_logger.info(f"Skipped {len(rows) - inserted} {table.name} rows already loaded")
+        return inserted
+    
+    def _copy_insert_new(self, session, table, rows: List[Dict]) -> int:
+        """COPY rows into a staging table, then merge them with one INSERT ... SELECT ... ON CONFLICT DO NOTHING"""
+        stage = stage_rows(session.connection(), table, rows)
+        stmt = self._insert(table).from_select(list(stage.c.keys()), select(*stage.c))
+        return session.execute(stmt.on_conflict_do_nothing()).rowcount
+    
+    @staticmethod
+    def _artist_conflict_update(stmt: Insert) -> Insert:
+        """
+        ON CONFLICT (id) DO UPDATE that only rewrites a row when a stored value
+        would change, or when full details arrive for a row older than
+        ARTIST_FRESHNESS_HOURS (so it counts as fresh again for hydration).
+        """
+        table = Artist.__table__
+        excluded = stmt.excluded
+        stale_before = datetime.now() - timedelta(hours=ARTIST_FRESHNESS_HOURS)
         
-        stmt = stmt.on_conflict_do_update(
+        # Rows built from simplified artist objects have NULL details; keep the
+        # stored values and only move updated_at when full details arrive
+        detail_columns = ['genre', 'popularity', 'followers', 'spotify_url', 'image_url']
+        changed = [
+            excluded.name.is_distinct_from(table.c.name),
+            excluded.normalized_name.is_distinct_from(table.c.normalized_name),
+            and_(excluded.popularity.isnot(None),
+                 or_(table.c.updated_at.is_(None), table.c.updated_at < stale_before))
+        ] + [
+            and_(excluded[column].isnot(None), excluded[column].is_distinct_from(table.c[column]))
+            for column in detail_columns
+        ]
+        return stmt.on_conflict_do_update(
             index_elements=['id'],
             set_={
-                'name': stmt.excluded.name,
-                'genre': stmt.excluded.genre,
-                'popularity': stmt.excluded.popularity,
-                'followers': stmt.excluded.followers,
-                'spotify_url': stmt.excluded.spotify_url,
-                'image_url': stmt.excluded.image_url,
-                'updated_at': stmt.excluded.updated_at
-            }
+                'name': excluded.name,
+                'normalized_name': excluded.normalized_name,
+                **{column: func.coalesce(excluded[column], table.c[column]) for column in detail_columns},
+                'updated_at': case(
+                    (excluded.popularity.isnot(None), excluded.updated_at),
+                    else_=table.c.updated_at
+                )
+            },
+            where=or_(*changed)
         )
+    
+    def _bulk_upsert_artists(self, session, artists: List[Dict]) -> Dict[str, int]:
+        """
+        Upsert artists in parameter-limit-sized chunks with SQLAlchemy Core,
+        or as one COPY merge for large PostgreSQL batches.
+        Returns inserted/updated/unchanged totals plus per-chunk counts.
+        """
+        totals = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'chunks': []}
+        if not artists:
+            return totals
         
-        session.execute(stmt)
\ No newline at end of file
+        # One row per id, last one wins: a statement may not update the same
+        # row twice, and the counts are per artist
+        artists = list({artist['id']: artist for artist in artists}.values())
+        table = Artist.__table__
+        if self._use_copy(artists):
+            chunks = [self._copy_upsert_artists(session, artists)]
+        else:
+            chunk_size = self._upsert_chunk_size(table)
+            chunks = (self._upsert_artist_chunk(session, artists[start:start + chunk_size])
+                      for start in range(0, len(artists), chunk_size))
+        for counts in chunks:
+            totals['chunks'].append(counts)
+            for key, value in counts.items():
+                totals[key] += value
+        
+        etl_logger.info(f"Artist upsert: {totals['inserted']} inserted, {totals['updated']} updated, "
+                        f"{totals['unchanged']} unchanged in {len(totals['chunks'])} chunks")
+        return totals
+    
+    @staticmethod
+    def _upsert_counts(rows: int, existing: int, written: int) -> Dict[str, int]:
+        # rowcount counts inserted rows plus conflicting rows the WHERE let through
+        return {'inserted': rows - existing, 'updated': written - (rows - existing), 'unchanged': rows - written}
+    
+    def _upsert_artist_chunk(self, session, chunk: List[Dict]) -> Dict[str, int]:
+        """Multi-VALUES upsert of one chunk"""
+        table = Artist.__table__
+        existing = session.execute(
+            select(func.count()).select_from(table).where(table.c.id.in_([artist['id'] for artist in chunk]))
+        ).scalar()
+        written = session.execute(self._artist_conflict_update(self._insert(table).values(chunk))).rowcount
+        return self._upsert_counts(len(chunk), existing, written)
+    
+    def _copy_upsert_artists(self, session, artists: List[Dict]) -> Dict[str, int]:
+        """COPY artists into a staging table, then merge them in one INSERT ... SELECT ... ON CONFLICT"""
+        table = Artist.__table__
+        # COPY bypasses column defaults, so fill the matching key here
+        rows = [{**artist, 'normalized_name': normalize_artist_name(artist['name'])} for artist in artists]
+        stage = stage_rows(session.connection(), table, rows)
+        existing = session.execute(
+            select(func.count()).select_from(stage.join(table, stage.c.id == table.c.id))
+        ).scalar()
+        stmt = self._artist_conflict_update(self._insert(table).from_select(list(stage.c.keys()), select(*stage.c)))
+        written = session.execute(stmt).rowcount
+        return self._upsert_counts(len(rows), existing, written)
\ No newline at end of file
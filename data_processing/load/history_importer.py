@@ -0,0 +1,165 @@
+# data_processing/load/history_importer.py
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Tuple
+from data_processing.extract.streaming_history import history_files
+from data_processing.load.db_loader import DatabaseLoader
+from data_processing.transform.history_transform import iter_history_chunks, stage_history_file
+from data_processing.transform.records import PlayRecord
+from data_processing.transform.utils import utc_naive
+from utils.config import HISTORY_IMPORT_CHUNK_SIZE, HISTORY_IMPORT_WORKERS
+from utils.logger import etl_logger
+
+STATE_FILE_NAME = '.import_state.json'
+
+class StreamingHistoryImporter:
+    """
+    Bulk importer for Spotify extended streaming history exports.
+    Worker processes parse and transform files into staged chunks; the parent
+    dedups each chunk against listening_history and loads it, recording
+    finished files in a state file so an interrupted import resumes where it
+    stopped.
+    """
+
+    def __init__(self, loader: DatabaseLoader = None, workers: int = None,
+                 chunk_size: int = None, state_path: str = None):
+        self.loader = loader or DatabaseLoader()
+        self.workers = workers or HISTORY_IMPORT_WORKERS
+        self.chunk_size = chunk_size or HISTORY_IMPORT_CHUNK_SIZE
+        self.state_path = state_path
+
+    @staticmethod
+    def _file_signature(path: str) -> Dict:
+        stat = os.stat(path)
+        return {'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+    def _load_state(self) -> Dict:
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                return json.load(f)
+        return {'completed': {}}
+
+    def _save_state(self, state: Dict) -> None:
+        """Write the state file atomically so a crash never leaves it half-written"""
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _staged_chunks(chunk_paths: List[str]) -> Iterator[List[PlayRecord]]:
+        """Read back a worker's staged chunks one at a time, removing each once read"""
+        for chunk_path in chunk_paths:
+            with open(chunk_path, 'rb') as f:
+                chunk = pickle.load(f)
+            os.remove(chunk_path)
+            yield chunk
+
+    def _transformed(self, files: List[str], stage_dir: str) -> Iterator[Tuple[str, Iterator[List[PlayRecord]]]]:
+        """Yield (path, play chunks) in file order, transforming up to `workers` files ahead"""
+        if self.workers <= 1:
+            for path in files:
+                yield path, iter_history_chunks(path, self.chunk_size)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            def submit(path: str):
+                return path, executor.submit(stage_history_file, path, self.chunk_size, stage_dir)
+
+            pending = []
+            remaining = iter(files)
+            for path in remaining:
+                pending.append(submit(path))
+                if len(pending) >= self.workers:
+                    break
+            while pending:
+                path, future = pending.pop(0)
+                yield path, self._staged_chunks(future.result())
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append(submit(next_path))
+
+    def _new_plays(self, chunk: List[PlayRecord]) -> List[PlayRecord]:
+        """Drop plays already in listening_history, compared to the second (or repeated within the chunk)"""
+        played = [utc_naive(play.played_at) for play in chunk]
+        seen = self.loader.existing_play_keys(min(played), max(played))
+        fresh = []
+        for play, played_at in zip(chunk, played):
+            key = (play.track_id, played_at)
+            if key not in seen:
+                seen.add(key)
+                fresh.append(play)
+        return fresh
+
+    def _load_plays(self, chunks: Iterator[List[PlayRecord]], extracted_at: datetime) -> Tuple[int, int]:
+        """Load one file's chunks; returns (rows read, plays loaded)"""
+        rows, loaded = 0, 0
+        for chunk in chunks:
+            rows += len(chunk)
+            fresh = self._new_plays(chunk)
+            if fresh:
+                play_rows = [play.to_row(extracted_at) for play in fresh]
+                loaded += self.loader.load_spotify_data({'listening_history': play_rows}).get('listening_history', 0)
+        return rows, loaded
+
+    def run(self, export_dir: str, on_file: Callable[[str, Dict], None] = None) -> Dict:
+        """
+        Import every history file in export_dir not already completed; returns
+        counts. on_file(name, file_stats) is called after each file is loaded.
+        """
+        if self.state_path is None:
+            self.state_path = os.path.join(export_dir, STATE_FILE_NAME)
+        state = self._load_state()
+
+        all_files = history_files(export_dir)
+        files = [
+            path for path in all_files
+            if state['completed'].get(os.path.basename(path), {}).get('signature') != self._file_signature(path)
+        ]
+        stats = {'files': 0, 'skipped_files': len(all_files) - len(files),
+                 'rows': 0, 'loaded': 0, 'duplicates': 0}
+        etl_logger.info(f"Importing {len(files)} history files ({stats['skipped_files']} already done)")
+
+        extracted_at = datetime.now()
+        start = time.perf_counter()
+        stage_dir = tempfile.mkdtemp(prefix='history_import_')
+        try:
+            for path, chunks in self._transformed(files, stage_dir):
+                file_start = time.perf_counter()
+                rows, loaded = self._load_plays(chunks, extracted_at)
+                elapsed = time.perf_counter() - file_start
+
+                name = os.path.basename(path)
+                file_stats = {
+                    'rows': rows,
+                    'loaded': loaded,
+                    'rows_per_sec': round(rows / max(elapsed, 1e-9), 1)
+                }
+                state['completed'][name] = {
+                    'signature': self._file_signature(path),
+                    'rows': rows,
+                    'loaded': loaded,
+                    'imported_at': datetime.now().isoformat()
+                }
+                self._save_state(state)
+
+                stats['files'] += 1
+                stats['rows'] += rows
+                stats['loaded'] += loaded
+                stats['duplicates'] += rows - loaded
+                etl_logger.info(f"{name}: {loaded}/{rows} new plays ({file_stats['rows_per_sec']:,.0f} rows/sec load)")
+                if on_file:
+                    on_file(name, file_stats)
+        finally:
+            shutil.rmtree(stage_dir, ignore_errors=True)
+
+        total = time.perf_counter() - start
+        stats['rows_per_sec'] = round(stats['rows'] / total, 1) if total > 0 else 0.0
+        etl_logger.info(f"Streaming history import finished: {stats}")
+        return stats
@@ -0,0 +1,60 @@
+# data_processing/load/pg_copy.py
+"""
+COPY FROM STDIN into per-transaction staging tables, so PostgreSQL loads
+can merge a whole batch into the real table with one set-based
+INSERT ... SELECT ... ON CONFLICT instead of parameter-bound VALUES lists.
+"""
+import io
+from datetime import date, datetime
+from typing import Dict, Iterable, List
+from sqlalchemy import Column, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+def _copy_value(value) -> str:
+    """One field in COPY text format (tab-separated, \\N for NULL)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+def copy_buffer(rows: Iterable[Dict], columns: List[str]) -> io.StringIO:
+    """Rows rendered as a COPY text-format stream"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(row.get(column)) for column in columns))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+def _copy_from(connection: Connection, sql: str, buffer: io.StringIO) -> None:
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, 'copy_expert'):  # psycopg2
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+def stage_rows(connection: Connection, table: Table, rows: List[Dict]) -> Table:
+    """
+    COPY rows into a temp table holding table's columns present in the rows,
+    dropped at commit. Returns the staging table for building the merge.
+    Runs on the caller's connection, so it shares the load's transaction.
+    """
+    columns = [column for column in table.columns if column.name in rows[0]]
+    names = ', '.join(column.name for column in columns)
+    stage_name = f"stage_{table.name}"
+
+    # Column types come from the target; constraints and defaults do not
+    connection.execute(text(f"DROP TABLE IF EXISTS pg_temp.{stage_name}"))
+    connection.execute(text(
+        f"CREATE TEMP TABLE {stage_name} ON COMMIT DROP AS SELECT {names} FROM {table.name} WITH NO DATA"
+    ))
+    _copy_from(connection, f"COPY {stage_name} ({names}) FROM STDIN",
+               copy_buffer(rows, [column.name for column in columns]))
+    return Table(stage_name, MetaData(), *[Column(column.name, column.type) for column in columns])
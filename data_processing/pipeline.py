@@ -0,0 +1,140 @@
+# data_processing/pipeline.py
+import queue
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Set
+from data_processing.extract.spotify_extract import SpotifyDataExtractor
+from data_processing.transform.spotify_transform import SpotifyDataTransformer
+from data_processing.load.db_loader import DatabaseLoader
+from utils.config import STREAM_BATCH_SIZE, STREAM_QUEUE_SIZE
+from utils.logger import etl_logger
+
+_DONE = object()
+
+class _StageFailure:
+    """Carries an exception from the producer thread to the loader"""
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class StreamingPipeline:
+    """
+    Streams extraction pages through transform into chunked loader commits.
+    Extract+transform run on a producer thread and hand batches to the
+    loader through a bounded queue, so a slow database blocks extraction
+    instead of letting batches pile up in memory.
+    """
+
+    def __init__(self, extractor: SpotifyDataExtractor, transformer: SpotifyDataTransformer = None,
+                 loader: DatabaseLoader = None, batch_size: int = None, queue_size: int = None):
+        self.extractor = extractor
+        self.transformer = transformer or SpotifyDataTransformer()
+        self.loader = loader or DatabaseLoader()
+        self.batch_size = batch_size or STREAM_BATCH_SIZE
+        self.queue_size = queue_size or STREAM_QUEUE_SIZE
+        self.loaded_artist_ids = set()
+        # Artists already hydrated (or fresh in the database) need no /artists lookup
+        self.hydrated_artist_ids: Set[str] = set()
+
+    @staticmethod
+    def _batches(items: Iterable, size: int) -> Iterator[List]:
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, size))
+            if not batch:
+                return
+            yield batch
+
+    @staticmethod
+    def _put(batches: queue.Queue, item, stop: threading.Event) -> bool:
+        """Blocking put that gives up once the consumer has stopped"""
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _hydrate(self, raw_key: str, batch: List[Dict]) -> List[Dict]:
+        """Full details for the batch's artists not yet hydrated this run"""
+        raw_data = {raw_key: batch}
+        artists = self.extractor.hydrate_artists(raw_data, self.hydrated_artist_ids)
+        tracks = [item['track'] for item in batch] if raw_key == 'recently_played' else batch
+        self.hydrated_artist_ids.update(artist['id'] for track in tracks for artist in track['artists'])
+        return artists
+
+    def _produce(self, source: Iterable, transform: Callable[[List, List], Dict], raw_key: str,
+                 batches: queue.Queue, stop: threading.Event) -> None:
+        try:
+            for batch in self._batches(source, self.batch_size):
+                artists = self._hydrate(raw_key, batch) if raw_key else []
+                if not self._put(batches, transform(batch, artists), stop):
+                    return
+        except Exception as e:
+            self._put(batches, _StageFailure(e), stop)
+        finally:
+            self._put(batches, _DONE, stop)
+
+    def run_source(self, name: str, source: Iterable, transform: Callable[[List, List], Dict],
+                   raw_key: str = None) -> Dict[str, int]:
+        """
+        Stream one source to the database; returns row counts. With raw_key
+        ('recently_played' or 'saved_tracks'), each batch's new artists are
+        hydrated on the producer thread before the batch is queued.
+        """
+        batches = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce, args=(source, transform, raw_key, batches, stop),
+            name=f"stream_{name}", daemon=True
+        )
+
+        stats = {'batches': 0, 'artists': 0, 'listening_history': 0}
+        start = time.perf_counter()
+        producer.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _StageFailure):
+                    raise item.error
+
+                # Artists repeat across batches; upsert each once per run
+                item['artists'] = [a for a in item.get('artists', []) if a['id'] not in self.loaded_artist_ids]
+                self.loaded_artist_ids.update(a['id'] for a in item['artists'])
+
+                loaded = self.loader.load_spotify_data(item)
+                stats['batches'] += 1
+                stats['artists'] += len(item['artists'])
+                stats['listening_history'] += loaded.get('listening_history', 0)
+        finally:
+            stop.set()
+            producer.join()
+
+        etl_logger.info(f"Streamed {name}: {stats} in {time.perf_counter() - start:.2f}s")
+        return stats
+
+    def run(self, played_after: datetime = None, fresh_artist_ids: Set[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Stream recently played and the saved library into the database.
+        fresh_artist_ids are skipped by hydration, like in extract_all_data.
+        """
+        self.hydrated_artist_ids.update(fresh_artist_ids or ())
+        return {
+            'recently_played': self.run_source(
+                'recently_played',
+                self.extractor.iter_recently_played(played_after),
+                self.transformer.transform_play_batch,
+                raw_key='recently_played'
+            ),
+            'saved_tracks': self.run_source(
+                'saved_tracks',
+                self.extractor.iter_saved_tracks(),
+                self.transformer.transform_track_batch,
+                raw_key='saved_tracks'
+            )
+        }
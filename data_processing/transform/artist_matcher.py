@@ -0,0 +1,112 @@
+# data_processing/transform/artist_matcher.py
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+from data_processing.transform.utils import normalize_artist_name
+from utils.config import ARTIST_MATCH_THRESHOLD
+
+def trigrams(normalized_name: str) -> Set[str]:
+    """Word trigrams, each word padded like pg_trgm ('  ab', ' abc', 'bc ')"""
+    grams = set()
+    for word in normalized_name.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+class ArtistMatcher:
+    """
+    Fuzzy artist-name matcher over a trigram inverted index.
+    Scores are the Dice coefficient of the trigram sets of the normalized
+    names. A lookup only reads the posting lists of the query's trigrams,
+    so cost follows how common those trigrams are, not the artist count.
+    """
+
+    def __init__(self, artists: Iterable[Tuple[str, str, Optional[int]]], threshold: float = None):
+        self.threshold = ARTIST_MATCH_THRESHOLD if threshold is None else threshold
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        popularities = array('i')
+        gram_counts = array('H')
+        postings: Dict[str, array] = {}
+        self.exact: Dict[str, int] = {}
+
+        for artist_id, name, popularity in artists:
+            normalized = normalize_artist_name(name)
+            if not normalized:
+                continue
+            position = len(self.ids)
+            grams = trigrams(normalized)
+            self.ids.append(artist_id)
+            self.names.append(name)
+            popularities.append(-1 if popularity is None else popularity)
+            gram_counts.append(min(len(grams), 65535))
+            for gram in grams:
+                postings.setdefault(gram, array('I')).append(position)
+
+            existing = self.exact.get(normalized)
+            if existing is None or popularities[position] > popularities[existing]:
+                self.exact[normalized] = position
+
+        # Frozen as numpy arrays so lookups count and score in vectorized passes
+        self.popularity = np.asarray(popularities, dtype=np.int32)
+        self.gram_counts = np.asarray(gram_counts, dtype=np.int32)
+        self.postings = {gram: np.asarray(positions, dtype=np.int32) for gram, positions in postings.items()}
+
+    @classmethod
+    def from_db(cls, db=None, threshold: float = None) -> 'ArtistMatcher':
+        """Build the index from the artists table"""
+        if db is None:
+            from database.db_manager import DatabaseManager
+            db = DatabaseManager()
+        return cls(db.get_artist_names(), threshold)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _candidate(self, position: int, score: float) -> Dict:
+        return {'artist_id': self.ids[position], 'name': self.names[position], 'score': round(score, 4)}
+
+    def candidates(self, name: str, limit: int = 5, threshold: float = None) -> List[Dict]:
+        """Ranked candidates scoring at least threshold, best first (ties go to the more popular artist)"""
+        threshold = self.threshold if threshold is None else threshold
+        grams = trigrams(normalize_artist_name(name))
+        postings = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not postings:
+            return []
+
+        # Shared-trigram counts for every artist touched by a query trigram
+        positions, overlaps = np.unique(np.concatenate(postings), return_counts=True)
+        scores = 2 * overlaps / (len(grams) + self.gram_counts[positions])
+        keep = scores >= threshold
+        positions, scores = positions[keep], scores[keep]
+
+        order = np.lexsort((-self.popularity[positions], -scores))[:limit]
+        return [self._candidate(int(positions[i]), float(scores[i])) for i in order]
+
+    def match(self, name: str, threshold: float = None) -> Optional[Dict]:
+        """Best candidate above threshold, or None"""
+        position = self.exact.get(normalize_artist_name(name))
+        if position is not None:
+            return self._candidate(position, 1.0)
+        candidates = self.candidates(name, limit=1, threshold=threshold)
+        return candidates[0] if candidates else None
+
+    def match_many(self, names: Iterable[str], threshold: float = None) -> Dict[str, Optional[Dict]]:
+        """Best match per name; each distinct normalized name is looked up once"""
+        by_normalized: Dict[str, Optional[Dict]] = {}
+        results = {}
+        for name in names:
+            normalized = normalize_artist_name(name)
+            if normalized not in by_normalized:
+                by_normalized[normalized] = self.match(name, threshold)
+            results[name] = by_normalized[normalized]
+        return results
+
+    def match_frame(self, df: pd.DataFrame, column: str = 'artist', threshold: float = None) -> pd.DataFrame:
+        """Add artist_id and match_score columns for a whole CSV's worth of names"""
+        matches = self.match_many(df[column].dropna().unique(), threshold)
+        df = df.copy()
+        df['artist_id'] = df[column].map(lambda name: (matches.get(name) or {}).get('artist_id'))
+        df['match_score'] = df[column].map(lambda name: (matches.get(name) or {}).get('score'))
+        return df
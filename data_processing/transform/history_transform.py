@@ -0,0 +1,51 @@
+# data_processing/transform/history_transform.py
+import os
+import pickle
+from typing import Dict, Iterator, List, Optional
+from data_processing.extract.streaming_history import iter_json_array
+from data_processing.transform.records import PlayRecord, parse_played_at
+
+def transform_history_entry(entry: Dict) -> Optional[PlayRecord]:
+    """Map one extended streaming history entry to a play; None for podcasts and blanks"""
+    uri = entry.get('spotify_track_uri')
+    track_name = entry.get('master_metadata_track_name')
+    if not uri or not track_name or not entry.get('ts'):
+        return None
+
+    return PlayRecord(
+        track_id=uri.rsplit(':', 1)[-1],
+        track_name=track_name,
+        # Exports carry artist names only; ids are filled by later API runs
+        artist_id=None,
+        artist_name=entry.get('master_metadata_album_artist_name'),
+        played_at=parse_played_at(entry['ts'])
+    )
+
+def iter_history_chunks(path: str, chunk_size: int) -> Iterator[List[PlayRecord]]:
+    """Stream-parse and transform an export file, chunk_size plays at a time"""
+    chunk = []
+    for entry in iter_json_array(path):
+        play = transform_history_entry(entry)
+        if play is None:
+            continue
+        chunk.append(play)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def stage_history_file(path: str, chunk_size: int, stage_dir: str) -> List[str]:
+    """
+    Transform an export file inside an importer worker, pickling each chunk
+    to stage_dir so only one chunk is held (or sent back) at a time.
+    Returns the chunk files in order.
+    """
+    staged = []
+    prefix = os.path.join(stage_dir, os.path.basename(path))
+    for index, chunk in enumerate(iter_history_chunks(path, chunk_size)):
+        chunk_path = f"{prefix}.{index:05d}.pickle"
+        with open(chunk_path, 'wb') as f:
+            pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+        staged.append(chunk_path)
+    return staged
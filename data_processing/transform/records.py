@@ -0,0 +1,158 @@
+# data_processing/transform/records.py
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+def best_image_url(images: list) -> Optional[str]:
+    """Prefer a medium-size image, fall back to the first available"""
+    if not images:
+        return None
+    for image in images:
+        if image.get('height', 0) in (300, 320, 400):
+            return image['url']
+    return images[0]['url']
+
+def parse_played_at(timestamp: str) -> datetime:
+    """
+    UTC play time truncated to the second. Streaming history exports only
+    carry seconds, so API plays are stored the same way and the
+    (track_id, played_at) key matches a play from either source.
+    """
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).replace(microsecond=0)
+
+
+@dataclass(slots=True)
+class ArtistRecord:
+    """The artist fields we store, copied out of a full or simplified API object"""
+    id: str
+    name: str
+    genre: Optional[str] = None
+    popularity: Optional[int] = None
+    followers: Optional[int] = None
+    spotify_url: Optional[str] = None
+    image_url: Optional[str] = None
+
+    @classmethod
+    def from_api(cls, artist: Dict) -> 'ArtistRecord':
+        return cls(
+            id=artist['id'],
+            name=artist['name'],
+            # Simplified artist objects carry no genres; keep NULL so the upsert preserves stored ones
+            genre=', '.join(artist['genres'])[:100] if 'genres' in artist else None,
+            popularity=artist.get('popularity'),
+            followers=(artist.get('followers') or {}).get('total'),
+            spotify_url=(artist.get('external_urls') or {}).get('spotify'),
+            image_url=best_image_url(artist.get('images'))
+        )
+
+    def merge(self, other: 'ArtistRecord') -> None:
+        """Fill missing fields from another record of the same artist; the latest popularity wins"""
+        for field in ('name', 'genre', 'followers', 'spotify_url', 'image_url'):
+            if getattr(self, field) is None:
+                setattr(self, field, getattr(other, field))
+        if other.popularity is not None:
+            self.popularity = other.popularity
+
+    def to_row(self, execution_date: datetime) -> Dict:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'genre': self.genre,
+            'popularity': self.popularity,
+            'followers': self.followers,
+            'spotify_url': self.spotify_url,
+            'image_url': self.image_url,
+            'created_at': execution_date,
+            'updated_at': execution_date
+        }
+
+
+@dataclass(slots=True)
+class TopTrackRecord:
+    track_id: str
+    name: str
+    artist_id: str
+    album_name: str
+    album_id: str
+    popularity: int
+    duration_ms: int
+    explicit: bool
+    rank: int
+
+    @classmethod
+    def from_api(cls, track: Dict, rank: int) -> 'TopTrackRecord':
+        # Use the first artist as primary (most common case)
+        return cls(
+            track_id=track['id'],
+            name=track['name'],
+            artist_id=track['artists'][0]['id'],
+            album_name=track['album']['name'],
+            album_id=track['album']['id'],
+            popularity=track['popularity'],
+            duration_ms=track['duration_ms'],
+            explicit=track['explicit'],
+            rank=rank
+        )
+
+    def to_row(self, execution_date: datetime, time_range: str) -> Dict:
+        return {
+            'track_id': self.track_id,
+            'name': self.name,
+            'artist_id': self.artist_id,
+            'album_name': self.album_name,
+            'album_id': self.album_id,
+            'popularity': self.popularity,
+            'duration_ms': self.duration_ms,
+            'explicit': self.explicit,
+            'extracted_date': execution_date,
+            'time_range': time_range,
+            'rank': self.rank,
+            'created_at': execution_date
+        }
+
+
+@dataclass(slots=True)
+class TopArtistRecord:
+    artist_id: str
+    rank: int
+
+    def to_row(self, execution_date: datetime, time_range: str) -> Dict:
+        return {
+            'artist_id': self.artist_id,
+            'extracted_date': execution_date,
+            'time_range': time_range,
+            'rank': self.rank,
+            'created_at': execution_date
+        }
+
+
+@dataclass(slots=True)
+class PlayRecord:
+    track_id: str
+    track_name: str
+    artist_id: Optional[str]
+    artist_name: Optional[str]
+    played_at: datetime
+
+    @classmethod
+    def from_api(cls, item: Dict) -> 'PlayRecord':
+        track = item['track']
+        primary_artist = track['artists'][0]
+        return cls(
+            track_id=track['id'],
+            track_name=track['name'],
+            artist_id=primary_artist['id'],
+            artist_name=primary_artist['name'],
+            played_at=parse_played_at(item['played_at'])
+        )
+
+    def to_row(self, execution_date: datetime) -> Dict:
+        return {
+            'track_id': self.track_id,
+            'track_name': self.track_name,
+            'artist_id': self.artist_id,
+            'artist_name': self.artist_name,
+            'played_at': self.played_at,
+            'extracted_at': execution_date,
+            'created_at': execution_date
+        }
@@ -1,6 +1,11 @@
 # transform/spotify_transform.py
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
+import numpy as np
+import pandas as pd
+from data_processing.transform.records import (
+    ArtistRecord, PlayRecord, TopArtistRecord, TopTrackRecord, best_image_url
+)
 from utils.logger import etl_logger
 from uuid import uuid4
 
@@ -72,114 +77,174 @@ class SpotifyDataTransformer:
             for artist_data in raw_data['top_artists']:
                 self._add_artist_to_map(artists_map, artist_data)
         
+        # Extract from batch-hydrated artists
+        if 'artists' in raw_data:
+            for artist_data in raw_data['artists']:
+                self._add_artist_to_map(artists_map, artist_data)
+        
         # Extract from recently played
         if 'recently_played' in raw_data:
             for item in raw_data['recently_played']:
                 for artist in item['track']['artists']:
                     self._add_artist_to_map(artists_map, artist)
         
-        # Convert to list and format for database
-        artists_list = []
-        for artist_id, artist_data in artists_map.items():
-            artists_list.append({
-                'id': artist_id,
-                'name': artist_data['name'],
-                'genre': ', '.join(artist_data.get('genres', []))[:100],  # Truncate if too long
-                'popularity': artist_data.get('popularity'),
-                'followers': artist_data.get('followers', {}).get('total'),
-                'spotify_url': artist_data.get('external_urls', {}).get('spotify'),
-                'image_url': self._get_artist_image(artist_data),
-                'created_at': self.execution_date,
-                'updated_at': self.execution_date
-            })
-        
-        return artists_list
+        return [record.to_row(self.execution_date) for record in artists_map.values()]
     
-    def _add_artist_to_map(self, artists_map: Dict, artist_data: Dict):
+    def _add_artist_to_map(self, artists_map: Dict[str, ArtistRecord], artist_data: Dict):
         """Add artist to map, keeping the most complete data"""
-        artist_id = artist_data['id']
+        existing = artists_map.get(artist_data['id'])
+        if existing is not None and existing.spotify_url is not None and 'popularity' not in artist_data:
+            # Simplified objects repeat once per play and only carry name and URL
+            return
         
-        if artist_id not in artists_map:
-            artists_map[artist_id] = artist_data
+        record = ArtistRecord.from_api(artist_data)
+        if existing is None:
+            artists_map[record.id] = record
         else:
-            # Merge data, preferring non-null values
-            existing = artists_map[artist_id]
-            for key, value in artist_data.items():
-                if value is not None and (existing.get(key) is None or key == 'popularity'):
-                    existing[key] = value
+            existing.merge(record)
     
     def _get_artist_image(self, artist_data: Dict) -> str:
         """Extract the best available artist image URL"""
-        images = artist_data.get('images', [])
-        if images:
-            # Prefer medium size, fall back to first available
-            medium_images = [img for img in images if img.get('height', 0) in [300, 320, 400]]
-            if medium_images:
-                return medium_images[0]['url']
-            return images[0]['url']
-        return None
+        return best_image_url(artist_data.get('images'))
     
     def _transform_top_tracks(self, top_tracks: List[Dict], time_range: str) -> List[Dict]:
         """Transform top tracks data with ranking"""
-        transformed_tracks = []
-        
-        for rank, track in enumerate(top_tracks, 1):
-            # Use the first artist as primary (most common case)
-            primary_artist = track['artists'][0]
-            
-            transformed_tracks.append({
-                'track_id': track['id'],
-                'name': track['name'],
-                'artist_id': primary_artist['id'],
-                'album_name': track['album']['name'],
-                'album_id': track['album']['id'],
-                'popularity': track['popularity'],
-                'duration_ms': track['duration_ms'],
-                'explicit': track['explicit'],
-                'extracted_date': self.execution_date,
-                'time_range': time_range,
-                'rank': rank,
-                'created_at': self.execution_date
-            })
-        
-        return transformed_tracks
+        return [
+            TopTrackRecord.from_api(track, rank).to_row(self.execution_date, time_range)
+            for rank, track in enumerate(top_tracks, 1)
+        ]
     
     def _transform_top_artists(self, top_artists: List[Dict], time_range: str) -> List[Dict]:
         """Transform top artists data with ranking"""
-        transformed_artists = []
-        
-        for rank, artist_data in enumerate(top_artists, 1):
-            transformed_artists.append({
-                'artist_id': artist_data['id'],
-                'extracted_date': self.execution_date,
-                'time_range': time_range,
-                'rank': rank,
-                'created_at': self.execution_date
-            })
-        
-        return transformed_artists
+        return [
+            TopArtistRecord(artist_data['id'], rank).to_row(self.execution_date, time_range)
+            for rank, artist_data in enumerate(top_artists, 1)
+        ]
     
     def _transform_listening_history(self, recently_played: List[Dict]) -> List[Dict]:
         """Transform recently played tracks into listening history"""
-        history = []
-        
-        for item in recently_played:
-            track = item['track']
-            # Use the first artist
-            primary_artist = track['artists'][0]
-            
-            history.append({
-                'track_id': track['id'],
-                'track_name': track['name'],
-                'artist_id': primary_artist['id'],
-                'artist_name': primary_artist['name'],
-                'played_at': datetime.fromisoformat(item['played_at'].replace('Z', '+00:00')),
-                'extracted_at': self.execution_date,
-                'created_at': self.execution_date
-            })
-        
-        return history
+        return [PlayRecord.from_api(item).to_row(self.execution_date) for item in recently_played]
+    
+    def transform_play_batch(self, recently_played: List[Dict], artists: List[Dict] = None) -> Dict:
+        """Transform one batch of plays (plus its hydrated artists) for the streaming pipeline"""
+        return {
+            'artists': self._transform_artists({'recently_played': recently_played, 'artists': artists or []}),
+            'listening_history': self._transform_listening_history(recently_played)
+        }
+    
+    def transform_track_batch(self, tracks: List[Dict], artists: List[Dict] = None) -> Dict:
+        """Transform one batch of saved tracks (their artists, plus hydrated ones) for the streaming pipeline"""
+        return {'artists': self._transform_artists({'top_tracks': tracks, 'artists': artists or []})}
     
+    def transform_all_data_columnar(self, raw_data: Dict, time_range: str = 'medium_term') -> Dict[str, pd.DataFrame]:
+        """
+        Columnar variant of transform_all_data for large imports.
+        Raw payloads are flattened straight into column arrays and returned as
+        DataFrames with the same columns as the row-based output.
+        """
+        try:
+            frames = {
+                'artists': self._frame_artists(raw_data),
+                'top_tracks': self._frame_top_tracks(raw_data.get('top_tracks', []), time_range),
+                'top_artists': self._frame_top_artists(raw_data.get('top_artists', []), time_range),
+                'listening_history': self._frame_listening_history(raw_data.get('recently_played', []))
+            }
+            etl_logger.info(f"Transformed (columnar) {len(frames['artists'])} artists, "
+                            f"{len(frames['top_tracks'])} top tracks, "
+                            f"{len(frames['top_artists'])} top artists, "
+                            f"{len(frames['listening_history'])} listening records")
+            return frames
+        except Exception as e:
+            etl_logger.error(f"Columnar transformation failed: {e}")
+            raise
+
+    def _frame_artists(self, raw_data: Dict) -> pd.DataFrame:
+        """Artists from all sources, merged per id like _add_artist_to_map"""
+        sources = [artist for track in raw_data.get('top_tracks', []) for artist in track['artists']]
+        sources += raw_data.get('top_artists', [])
+        sources += raw_data.get('artists', [])
+        sources += [artist for item in raw_data.get('recently_played', []) for artist in item['track']['artists']]
+
+        # Simplified objects repeat once per play; one per artist is enough
+        seen_simplified = set()
+        unique_sources = []
+        for artist in sources:
+            if 'popularity' not in artist:
+                if artist['id'] in seen_simplified:
+                    continue
+                seen_simplified.add(artist['id'])
+            unique_sources.append(artist)
+        sources = unique_sources
+
+        columns = ['id', 'name', 'genre', 'popularity', 'followers', 'spotify_url', 'image_url',
+                   'created_at', 'updated_at']
+        if not sources:
+            return pd.DataFrame(columns=columns)
+
+        frame = pd.DataFrame({
+            'id': [artist['id'] for artist in sources],
+            'name': [artist['name'] for artist in sources],
+            'genre': [', '.join(artist['genres'])[:100] if 'genres' in artist else None for artist in sources],
+            'popularity': pd.array([artist.get('popularity') for artist in sources], dtype='Int64'),
+            'followers': pd.array([(artist.get('followers') or {}).get('total') for artist in sources], dtype='Int64'),
+            'spotify_url': [(artist.get('external_urls') or {}).get('spotify') for artist in sources],
+            'image_url': [self._get_artist_image(artist) for artist in sources]
+        })
+
+        # First non-null value wins, except popularity where the latest non-null wins
+        grouped = frame.groupby('id', sort=False)
+        merged = grouped.first()
+        merged['popularity'] = grouped['popularity'].last()
+        merged = merged.reset_index()
+        merged['created_at'] = self.execution_date
+        merged['updated_at'] = self.execution_date
+        return merged[columns]
+
+    def _frame_top_tracks(self, top_tracks: List[Dict], time_range: str) -> pd.DataFrame:
+        """Top tracks as columns, ranked in input order"""
+        frame = pd.DataFrame({
+            'track_id': [track['id'] for track in top_tracks],
+            'name': [track['name'] for track in top_tracks],
+            'artist_id': [track['artists'][0]['id'] for track in top_tracks],
+            'album_name': [track['album']['name'] for track in top_tracks],
+            'album_id': [track['album']['id'] for track in top_tracks],
+            'popularity': pd.array([track['popularity'] for track in top_tracks], dtype='Int64'),
+            'duration_ms': pd.array([track['duration_ms'] for track in top_tracks], dtype='Int64'),
+            'explicit': pd.array([track['explicit'] for track in top_tracks], dtype='boolean')
+        })
+        frame['extracted_date'] = self.execution_date
+        frame['time_range'] = time_range
+        frame['rank'] = range(1, len(frame) + 1)
+        frame['created_at'] = self.execution_date
+        return frame
+
+    def _frame_top_artists(self, top_artists: List[Dict], time_range: str) -> pd.DataFrame:
+        """Top artist rankings as columns"""
+        frame = pd.DataFrame({'artist_id': [artist['id'] for artist in top_artists]})
+        frame['extracted_date'] = self.execution_date
+        frame['time_range'] = time_range
+        frame['rank'] = range(1, len(frame) + 1)
+        frame['created_at'] = self.execution_date
+        return frame
+
+    def _frame_listening_history(self, recently_played: List[Dict]) -> pd.DataFrame:
+        """Plays as columns with vectorized timestamp parsing"""
+        tracks = [item['track'] for item in recently_played]
+        frame = pd.DataFrame({
+            'track_id': [track['id'] for track in tracks],
+            'track_name': [track['name'] for track in tracks],
+            'artist_id': [track['artists'][0]['id'] for track in tracks],
+            'artist_name': [track['artists'][0]['name'] for track in tracks],
+            # Spotify timestamps are always UTC ('Z'); numpy's C ISO parser is much faster than to_datetime.
+            # Truncated to the second like parse_played_at
+            'played_at': pd.DatetimeIndex(
+                np.array([item['played_at'].rstrip('Z') for item in recently_played], dtype='datetime64[us]')
+            ).floor('s').tz_localize('UTC')
+        })
+        frame['extracted_at'] = self.execution_date
+        frame['created_at'] = self.execution_date
+        return frame
+
     def handle_artist_not_found(self, artist_name: str) -> Dict:
         """
         Handle cases where an artist is not found in Spotify data
@@ -1,7 +1,38 @@
+import re
+import unicodedata
+from datetime import datetime, timezone
+from functools import lru_cache
+
+_APOSTROPHES = re.compile(r"['’`]")
+_NON_WORD = re.compile(r'[\W_]+')
+
 def clean_artist_name(artist_name: str) -> str:
     """Clean and standardize artist name for searching and comparison"""
     return artist_name.strip()\
                       .lower()\
                       .replace(' ', '_')\
                       .replace('-', '_')\
-                      .replace("'", '')
\ No newline at end of file
+                      .replace("'", '')
+
+@lru_cache(maxsize=65536)
+def normalize_artist_name(artist_name: str) -> str:
+    """
+    Matching key stored in artists.normalized_name: Unicode/diacritic folded,
+    case-insensitive, '&'/'+' read as 'and', punctuation dropped and a leading
+    'the' removed ("The National" -> "national", "Beyoncé" -> "beyonce")
+    """
+    if not artist_name:
+        return ''
+    folded = unicodedata.normalize('NFKD', artist_name)
+    folded = ''.join(char for char in folded if not unicodedata.combining(char)).casefold()
+    folded = _APOSTROPHES.sub('', folded).replace('&', ' and ').replace('+', ' and ')
+    words = _NON_WORD.sub(' ', folded).split()
+    if len(words) > 1 and words[0] == 'the':
+        words = words[1:]
+    return ' '.join(words)
+
+def utc_naive(value: datetime) -> datetime:
+    """Datetime as stored in the naive DateTime columns: UTC without tzinfo"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
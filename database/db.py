@@ -1,14 +1,17 @@
 # db.py
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from utils.config import DB_PATH
+from utils.config import DB_URL
 from sqlalchemy.orm import sessionmaker
+from database.engine import get_engine
 
-SQLALCHEMY_DATABASE_URI = f'sqlite:///{DB_PATH}'
+SQLALCHEMY_DATABASE_URI = DB_URL
 SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-engine = create_engine(SQLALCHEMY_DATABASE_URI)
+# Writer engine for the ETL; dashboard reads go through the read-only pool
+engine = get_engine(SQLALCHEMY_DATABASE_URI)
+read_engine = get_engine(SQLALCHEMY_DATABASE_URI, read_only=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 # Dependency for sessions (optional)
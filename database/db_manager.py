@@ -1,16 +1,22 @@
 # database/db_manager.py
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import pandas as pd
 
-from .db import SessionLocal
+from .db import ReadSessionLocal, SessionLocal
+from .models import Artist
+from .spatial import venues_in_bbox, venues_within_radius
 
 class DatabaseManager:
     """Simplified database interface for CRUD operations"""
     
     def __init__(self):
         self.session_factory = SessionLocal
+        # Read-only pool: queries never wait behind the ETL writer under WAL
+        self.read_session_factory = ReadSessionLocal
     
     def bulk_insert(self, data: List[Dict], model: Any) -> bool:
         """Bulk insert records"""
@@ -27,7 +33,7 @@ class DatabaseManager:
     
     def get_all(self, model: Any, filters: Dict = None) -> List[Any]:
         """Get all records with optional filtering"""
-        session = self.session_factory()
+        session = self.read_session_factory()
         try:
             query = session.query(model)
             if filters:
@@ -38,6 +44,51 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def get_max_value(self, model: Any, column: str) -> Any:
+        """Get the maximum value of a column, or None if the table is empty"""
+        session = self.read_session_factory()
+        try:
+            return session.query(func.max(getattr(model, column))).scalar()
+        finally:
+            session.close()
+
+    def get_fresh_ids(self, model: Any, since: datetime, required_column: str = None) -> Set[Any]:
+        """Get ids of records updated since a timestamp, optionally requiring a non-null column"""
+        session = self.read_session_factory()
+        try:
+            query = session.query(model.id).filter(model.updated_at >= since)
+            if required_column:
+                query = query.filter(getattr(model, required_column).isnot(None))
+            return {row[0] for row in query.all()}
+        finally:
+            session.close()
+
+    def get_artist_ids_by_normalized_name(self, names: Iterable[str], chunk_size: int = 500) -> Dict[str, str]:
+        """Map normalized artist names to artist ids via the normalized_name index"""
+        wanted = list({name for name in names if name})
+        session = self.read_session_factory()
+        try:
+            matches = {}
+            for start in range(0, len(wanted), chunk_size):
+                # Prefer hydrated Spotify artists over placeholder rows with the same name
+                rows = session.query(Artist.normalized_name, Artist.id)\
+                              .filter(Artist.normalized_name.in_(wanted[start:start + chunk_size]))\
+                              .order_by(Artist.popularity.is_(None), Artist.popularity.desc())\
+                              .all()
+                for normalized_name, artist_id in rows:
+                    matches.setdefault(normalized_name, artist_id)
+            return matches
+        finally:
+            session.close()
+
+    def get_artist_names(self) -> List[Tuple[str, str, Optional[int]]]:
+        """(id, name, popularity) for every artist, for building name indexes"""
+        session = self.read_session_factory()
+        try:
+            return [tuple(row) for row in session.query(Artist.id, Artist.name, Artist.popularity).all()]
+        finally:
+            session.close()
+
     def delete(self, model: Any, filters: Dict) -> bool:
         """Delete records matching filters"""
         session = self.session_factory()
@@ -70,4 +121,22 @@ class DatabaseManager:
             session.rollback()
             return False
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+    def get_venues_in_bbox(self, min_lat: float, min_lon: float,
+                           max_lat: float, max_lon: float) -> List[Dict]:
+        """Venues with their shows inside a map viewport"""
+        session = self.read_session_factory()
+        try:
+            return venues_in_bbox(session, min_lat, min_lon, max_lat, max_lon)
+        finally:
+            session.close()
+
+    def get_venues_near(self, latitude: float, longitude: float,
+                        radius_km: float, limit: int = None) -> List[Dict]:
+        """Venues with their shows within radius_km, nearest first"""
+        session = self.read_session_factory()
+        try:
+            return venues_within_radius(session, latitude, longitude, radius_km, limit)
+        finally:
+            session.close()
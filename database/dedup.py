@@ -0,0 +1,35 @@
+# database/dedup.py
+from typing import Dict, Union
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from utils.logger import etl_logger
+
+# (unique index, table, natural key), spelled out so the migration that runs
+# this cleanup keeps doing the same thing as the models change
+NATURAL_KEYS = (
+    ('uq_listening_history_play', 'listening_history', ('track_id', 'played_at')),
+    ('uq_top_tracks_ranking', 'top_tracks', ('extracted_date', 'time_range', 'rank')),
+    ('uq_top_artists_ranking', 'top_artists', ('extracted_date', 'time_range', 'rank')),
+)
+
+def dedup_natural_keys(bind: Union[Engine, Connection]) -> Dict[str, int]:
+    """
+    One-time cleanup for databases created before the natural-key indexes:
+    delete rows repeating a natural key (keeping the earliest id), then
+    create the unique indexes. Safe to re-run; returns rows deleted per table.
+    """
+    if isinstance(bind, Engine):
+        with bind.begin() as connection:
+            return dedup_natural_keys(connection)
+
+    deleted = {}
+    for index_name, table_name, columns in NATURAL_KEYS:
+        key_columns = ', '.join(columns)
+        result = bind.execute(text(
+            f"DELETE FROM {table_name} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {table_name} GROUP BY {key_columns})"
+        ))
+        deleted[table_name] = result.rowcount
+        bind.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table_name} ({key_columns})"))
+    etl_logger.info(f"Natural-key dedup removed {deleted}")
+    return deleted
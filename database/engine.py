@@ -0,0 +1,107 @@
+# database/engine.py
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Dict, Tuple
+from sqlalchemy import Table, create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.sql.dml import Insert
+from utils.config import (
+    SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_SIZE_KB, SQLITE_JOURNAL_MODE, SQLITE_MMAP_SIZE,
+    SQLITE_READ_POOL_SIZE, SQLITE_SYNCHRONOUS, SQLITE_TEMP_STORE, UPSERT_MAX_PARAMS
+)
+
+# Default bound-parameter limits for non-SQLite backends
+BIND_PARAM_LIMITS = {'postgresql': 65535, 'mysql': 65535}
+STATEMENT_EXTRA_PARAMS = 100
+
+def sqlite_pragmas(read_only: bool = False) -> Dict[str, str]:
+    """Pragma profile applied to every new SQLite connection, in order"""
+    pragmas = {
+        'busy_timeout': str(SQLITE_BUSY_TIMEOUT_MS),
+        'cache_size': str(-SQLITE_CACHE_SIZE_KB),  # Negative means KiB rather than pages
+        'mmap_size': str(SQLITE_MMAP_SIZE),
+        'temp_store': SQLITE_TEMP_STORE,
+    }
+    if read_only:
+        pragmas['query_only'] = 'ON'
+    else:
+        # journal_mode is persistent in the file, so the writer sets it for everyone
+        pragmas['journal_mode'] = SQLITE_JOURNAL_MODE
+        pragmas['synchronous'] = SQLITE_SYNCHRONOUS
+    return pragmas
+
+def _install_pragmas(engine: Engine, pragmas: Dict[str, str]) -> None:
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+def create_db_engine(db_url: str, read_only: bool = False, **kwargs) -> Engine:
+    """
+    Create an engine with the SQLite performance profile (WAL, tuned pragmas).
+    The writer pool holds a single connection so in-process writes queue up
+    instead of failing with 'database is locked'; the read-only pool serves
+    concurrent dashboard queries against WAL snapshots. Other backends get
+    a plain engine.
+    """
+    url = make_url(db_url)
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        return create_engine(db_url, **kwargs)
+
+    pool_options = {'pool_size': SQLITE_READ_POOL_SIZE, 'max_overflow': 0} if read_only \
+        else {'pool_size': 1, 'max_overflow': 0}
+    # pysqlite's own busy wait; the busy_timeout pragma covers it too
+    connect_args = {'check_same_thread': False, 'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}
+    engine = create_engine(db_url, connect_args=connect_args, **{**pool_options, **kwargs})
+    _install_pragmas(engine, sqlite_pragmas(read_only))
+    return engine
+
+
+_engines: Dict[Tuple[str, bool], Engine] = {}
+_engines_lock = threading.Lock()
+
+def get_engine(db_url: str, read_only: bool = False) -> Engine:
+    """Process-wide writer or read-only engine for a database URL"""
+    key = (db_url, read_only)
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = create_db_engine(db_url, read_only=read_only)
+        return _engines[key]
+
+def upsert_insert(table: Table, dialect_name: str) -> Insert:
+    """INSERT construct with ON CONFLICT support for SQLite or PostgreSQL"""
+    if dialect_name == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+@lru_cache(maxsize=None)
+def _sqlite_variable_limit() -> int:
+    """
+    Variable limit of the SQLite library every pysqlite connection links
+    against. Probed on a scratch in-memory connection so callers holding
+    the single writer connection never wait on the pool.
+    """
+    connection = sqlite3.connect(':memory:')
+    try:
+        return connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    finally:
+        connection.close()
+
+def max_bind_params(dialect_name: str) -> int:
+    """Bound-parameter limit of a backend"""
+    if UPSERT_MAX_PARAMS:
+        return UPSERT_MAX_PARAMS
+    if dialect_name == 'sqlite':
+        return _sqlite_variable_limit()
+    return BIND_PARAM_LIMITS.get(dialect_name, 999)
+
+def upsert_chunk_size(table: Table, dialect_name: str) -> int:
+    """Rows per multi-VALUES statement that stay under the parameter limit"""
+    # Leave room for parameters bound outside VALUES, such as an upsert's WHERE
+    return max(1, (max_bind_params(dialect_name) - STATEMENT_EXTRA_PARAMS) // len(table.columns))
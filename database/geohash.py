@@ -0,0 +1,82 @@
+# database/geohash.py
+import math
+from typing import List, Tuple
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9  # ~5m cells, plenty for venues
+EARTH_RADIUS_KM = 6371.0088
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a coordinate as a geohash string"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+
+    return ''.join(chars)
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Height and width in degrees of a geohash cell at a precision"""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+def covering_cells(min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                   max_cells: int = 32) -> List[str]:
+    """
+    Geohash prefixes whose cells together cover a bounding box, using the
+    finest precision that needs no more than max_cells prefixes.
+    """
+    if min_lon > max_lon:
+        raise ValueError("Bounding boxes crossing the antimeridian are not supported")
+
+    cells = ['']  # Precision 0 covers everything
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        lat_step, lon_step = cell_size(precision)
+        lat_start = math.floor((min_lat + 90) / lat_step)
+        lat_end = math.floor((min(max_lat, 89.999999) + 90) / lat_step)
+        lon_start = math.floor((min_lon + 180) / lon_step)
+        lon_end = math.floor((min(max_lon, 179.999999) + 180) / lon_step)
+        if (lat_end - lat_start + 1) * (lon_end - lon_start + 1) > max_cells:
+            break
+
+        # Encode the centre of every cell in the grid
+        cells = sorted({
+            encode_geohash(-90 + (i + 0.5) * lat_step, -180 + (j + 0.5) * lon_step, precision)
+            for i in range(lat_start, lat_end + 1)
+            for j in range(lon_start, lon_end + 1)
+        })
+    return cells
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lon, max_lat, max_lon) enclosing a circle"""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    lon_delta = 180.0 if cos_lat < 1e-9 else min(180.0, lat_delta / cos_lat)
+    return (max(-90.0, latitude - lat_delta), max(-180.0, longitude - lon_delta),
+            min(90.0, latitude + lat_delta), min(180.0, longitude + lon_delta))
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,127 @@
+# database/migrations.py
+"""
+Versioned, forward-only schema migrations for databases that already hold
+data. Fresh databases get the full schema from Base.metadata.create_all;
+every migration is written to be a no-op on them, so the runner can be
+called unconditionally at startup.
+"""
+from collections import namedtuple
+from datetime import datetime
+from typing import List, Tuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, bindparam, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from database.dedup import dedup_natural_keys
+from database.geohash import encode_geohash
+from database.models import Artist, MusicVenue
+from database.db import Base
+from data_processing.transform.utils import normalize_artist_name
+from utils.logger import etl_logger
+
+Migration = namedtuple('Migration', ['version', 'name', 'apply'])
+
+_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', _metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String, nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+def _add_column(connection: Connection, model, column_name: str) -> bool:
+    """ALTER TABLE ... ADD COLUMN for a model column missing from the live table"""
+    table = model.__table__
+    existing = {column['name'] for column in inspect(connection).get_columns(table.name)}
+    if column_name in existing:
+        return False
+    column_type = table.c[column_name].type.compile(dialect=connection.dialect)
+    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_name} {column_type}"))
+    return True
+
+def _create_indexes(connection: Connection, indexes: List[Tuple[str, str, Tuple[str, ...]]]) -> None:
+    """
+    CREATE INDEX IF NOT EXISTS for (name, table, columns) entries. Migrations
+    spell their indexes out rather than reading the models, so what a
+    version does never changes after it has shipped.
+    """
+    for name, table_name, columns in indexes:
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table_name} ({', '.join(columns)})"))
+
+def _add_venue_geohash(connection: Connection) -> None:
+    _add_column(connection, MusicVenue, 'geohash')
+    _create_indexes(connection, [('ix_music_venues_geohash', 'music_venues', ('geohash',))])
+    table = MusicVenue.__table__
+    rows = connection.execute(
+        select(table.c.id, table.c.latitude, table.c.longitude).where(
+            table.c.geohash.is_(None), table.c.latitude.isnot(None), table.c.longitude.isnot(None)
+        )
+    ).all()
+    if rows:
+        connection.execute(
+            table.update().where(table.c.id == bindparam('venue_id')).values(geohash=bindparam('new_geohash')),
+            [{'venue_id': venue_id, 'new_geohash': encode_geohash(float(lat), float(lon))} for venue_id, lat, lon in rows]
+        )
+
+def _add_artist_normalized_name(connection: Connection) -> None:
+    _add_column(connection, Artist, 'normalized_name')
+    _create_indexes(connection, [('ix_artists_normalized_name', 'artists', ('normalized_name',))])
+    table = Artist.__table__
+    rows = connection.execute(
+        select(table.c.id, table.c.name).where(table.c.normalized_name.is_(None), table.c.name.isnot(None))
+    ).all()
+    if rows:
+        connection.execute(
+            table.update().where(table.c.id == bindparam('artist_id')).values(normalized_name=bindparam('normalized')),
+            [{'artist_id': artist_id, 'normalized': normalize_artist_name(name)} for artist_id, name in rows]
+        )
+
+def _dedup_natural_keys(connection: Connection) -> None:
+    dedup_natural_keys(connection)
+
+def _dashboard_indexes(connection: Connection) -> None:
+    """played_at, artist_id foreign keys, show dates and lineups"""
+    _create_indexes(connection, [
+        ('ix_listening_history_played_at', 'listening_history', ('played_at',)),
+        ('ix_listening_history_artist_id', 'listening_history', ('artist_id',)),
+        ('ix_top_tracks_artist_id', 'top_tracks', ('artist_id',)),
+        ('ix_top_artists_artist_id', 'top_artists', ('artist_id',)),
+        ('ix_show_events_venue_id', 'show_events', ('venue_id',)),
+        ('ix_show_events_date', 'show_events', ('date',)),
+        ('ix_show_artists_artist_id', 'show_artists', ('artist_id',)),
+        ('ix_show_artists_show_id', 'show_artists', ('show_id',)),
+    ])
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'add_venue_geohash', _add_venue_geohash),
+    Migration(2, 'add_artist_normalized_name', _add_artist_normalized_name),
+    Migration(3, 'dedup_natural_keys', _dedup_natural_keys),
+    Migration(4, 'dashboard_indexes', _dashboard_indexes),
+]
+
+def applied_versions(engine: Engine) -> List[int]:
+    _metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        return [row[0] for row in connection.execute(select(schema_migrations.c.version))]
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Apply pending migrations in order, each in its own transaction; returns versions applied"""
+    Base.metadata.create_all(bind=engine)
+    done = set(applied_versions(engine))
+
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda migration: migration.version):
+        if migration.version in done:
+            continue
+        with engine.begin() as connection:
+            # Another process may have applied it since we looked
+            already = connection.execute(
+                select(schema_migrations.c.version).where(schema_migrations.c.version == migration.version)
+            ).first()
+            if already:
+                continue
+            migration.apply(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=migration.version, name=migration.name, applied_at=datetime.now()
+            ))
+        etl_logger.info(f"Applied migration {migration.version}: {migration.name}")
+        applied.append(migration.version)
+    return applied
@@ -1,8 +1,30 @@
+import math
 from database.db import Base
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Boolean, Text
+from database.geohash import encode_geohash
+from data_processing.transform.utils import normalize_artist_name
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Numeric, Boolean, Text, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+def venue_geohash(latitude, longitude):
+    """Geohash of a coordinate pair; None when either is missing (None or NaN)"""
+    if latitude is None or longitude is None:
+        return None
+    latitude, longitude = float(latitude), float(longitude)
+    if math.isnan(latitude) or math.isnan(longitude):
+        return None
+    return encode_geohash(latitude, longitude)
+
+def _venue_geohash(context):
+    """Column default: geohash of the row's coordinates (also fires for bulk inserts)"""
+    params = context.get_current_parameters()
+    return venue_geohash(params.get('latitude'), params.get('longitude'))
+
+def _artist_normalized_name(context):
+    """Column default: matching key for the row's name (also fires for bulk upserts)"""
+    name = context.get_current_parameters().get('name')
+    return normalize_artist_name(name) if name else None
+
 class MusicVenue(Base):
     __tablename__ = 'music_venues'
     
@@ -11,19 +33,25 @@ class MusicVenue(Base):
     location = Column(String, nullable=False)
     latitude = Column(Numeric(10, 6))  # For maps
     longitude = Column(Numeric(10, 6))  # For maps
+    geohash = Column(String(12), index=True, default=_venue_geohash)  # For spatial queries
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationship
     shows = relationship("ShowEvent", back_populates="venue")
 
+@event.listens_for(MusicVenue, 'before_update')
+def _update_venue_geohash(mapper, connection, target):
+    """Keep geohash in sync when coordinates change through the ORM"""
+    target.geohash = venue_geohash(target.latitude, target.longitude)
+
 class ShowEvent(Base):
     __tablename__ = 'show_events'
     
     id = Column(Integer, primary_key=True, index=True)
-    venue_id = Column(Integer, ForeignKey('music_venues.id'), nullable=False)
+    venue_id = Column(Integer, ForeignKey('music_venues.id'), nullable=False, index=True)
     event = Column(String, nullable=False)
-    date = Column(DateTime, nullable=False)
+    date = Column(DateTime, nullable=False, index=True)
     ticket_price = Column(Numeric)
     notes = Column(Text)
     is_festival = Column(Boolean, default=False)
@@ -39,8 +67,8 @@ class ShowArtist(Base):
     __tablename__ = 'show_artists'
     
     id = Column(Integer, primary_key=True, index=True)
-    artist_id = Column(String, ForeignKey('artists.id'), nullable=False)
-    show_id = Column(Integer, ForeignKey('show_events.id'), nullable=False)
+    artist_id = Column(String, ForeignKey('artists.id'), nullable=False, index=True)
+    show_id = Column(Integer, ForeignKey('show_events.id'), nullable=False, index=True)
     is_headliner = Column(Boolean, default=False)
     set_rating = Column(Integer)  # Rating out of 10
     notes = Column(Text)
@@ -55,6 +83,7 @@ class Artist(Base):
     
     id = Column(String, primary_key=True)  # Spotify artist ID
     name = Column(String, nullable=False)
+    normalized_name = Column(String, index=True, default=_artist_normalized_name)  # For name matching
     genre = Column(String)
     popularity = Column(Integer)
     followers = Column(Integer)
@@ -69,13 +98,29 @@ class Artist(Base):
     listening_history = relationship("ListeningHistory", back_populates="artist")
     show_appearances = relationship("ShowArtist", back_populates="artist")
 
+@event.listens_for(Artist, 'before_update')
+def _update_artist_normalized_name(mapper, connection, target):
+    """Keep normalized_name in sync when the name changes through the ORM"""
+    target.normalized_name = normalize_artist_name(target.name) if target.name else None
+
+class ArtistSearchCache(Base):
+    __tablename__ = 'artist_search_cache'
+    
+    cleaned_name = Column(String, primary_key=True)  # clean_artist_name() of the searched name
+    artist_id = Column(String)  # NULL when the search found no match
+    searched_at = Column(DateTime, nullable=False)
+
 class TopTrack(Base):
     __tablename__ = 'top_tracks'
+    __table_args__ = (
+        # Natural key; loads insert with ON CONFLICT DO NOTHING against it
+        Index('uq_top_tracks_ranking', 'extracted_date', 'time_range', 'rank', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     track_id = Column(String, nullable=False)
     name = Column(String, nullable=False)
-    artist_id = Column(String, ForeignKey('artists.id'), nullable=False)
+    artist_id = Column(String, ForeignKey('artists.id'), nullable=False, index=True)
     album_name = Column(String)
     album_id = Column(String)
     popularity = Column(Integer)
@@ -91,9 +136,12 @@ class TopTrack(Base):
 
 class TopArtist(Base):
     __tablename__ = 'top_artists'
+    __table_args__ = (
+        Index('uq_top_artists_ranking', 'extracted_date', 'time_range', 'rank', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    artist_id = Column(String, ForeignKey('artists.id'), nullable=False)
+    artist_id = Column(String, ForeignKey('artists.id'), nullable=False, index=True)
     extracted_date = Column(DateTime, nullable=False)
     time_range = Column(String, nullable=False)
     rank = Column(Integer, nullable=False)
@@ -104,13 +152,16 @@ class TopArtist(Base):
 
 class ListeningHistory(Base):
     __tablename__ = 'listening_history'
+    __table_args__ = (
+        Index('uq_listening_history_play', 'track_id', 'played_at', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     track_id = Column(String, nullable=False)
     track_name = Column(String, nullable=False)
-    artist_id = Column(String, ForeignKey('artists.id'))
+    artist_id = Column(String, ForeignKey('artists.id'), index=True)
     artist_name = Column(String)
-    played_at = Column(DateTime, nullable=False)
+    played_at = Column(DateTime, nullable=False, index=True)
     extracted_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime)
     
@@ -0,0 +1,64 @@
+# database/spatial.py
+from typing import Dict, List
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
+from database.geohash import bounding_box, covering_cells, haversine_km
+from database.models import MusicVenue
+
+def _venue_to_dict(venue: MusicVenue) -> Dict:
+    """Venue with its shows, shaped for a map view"""
+    return {
+        'id': venue.id,
+        'name': venue.name,
+        'location': venue.location,
+        'latitude': float(venue.latitude),
+        'longitude': float(venue.longitude),
+        'shows': [
+            {'id': show.id, 'event': show.event, 'date': show.date, 'is_festival': show.is_festival}
+            for show in sorted(venue.shows, key=lambda show: show.date)
+        ]
+    }
+
+def _query_bbox(session: Session, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                with_shows: bool = True):
+    """Venues inside a bounding box, pre-filtered by geohash prefix ranges on the index"""
+    # Each prefix becomes an index range scan: prefix <= geohash < prefix + '~'
+    prefix_ranges = [
+        and_(MusicVenue.geohash >= prefix, MusicVenue.geohash < prefix + '~')
+        for prefix in covering_cells(min_lat, min_lon, max_lat, max_lon)
+        if prefix
+    ]
+
+    query = session.query(MusicVenue)
+    if prefix_ranges:
+        query = query.filter(or_(*prefix_ranges))
+    query = query.filter(
+        MusicVenue.latitude.between(min_lat, max_lat),
+        MusicVenue.longitude.between(min_lon, max_lon)
+    )
+    if with_shows:
+        query = query.options(selectinload(MusicVenue.shows))
+    return query
+
+def venues_in_bbox(session: Session, min_lat: float, min_lon: float,
+                   max_lat: float, max_lon: float) -> List[Dict]:
+    """Venues (with their shows) inside a map viewport"""
+    venues = _query_bbox(session, min_lat, min_lon, max_lat, max_lon).all()
+    return [_venue_to_dict(venue) for venue in venues]
+
+def venues_within_radius(session: Session, latitude: float, longitude: float,
+                         radius_km: float, limit: int = None) -> List[Dict]:
+    """Venues (with their shows) within radius_km, nearest first"""
+    venues = _query_bbox(session, *bounding_box(latitude, longitude, radius_km)).all()
+
+    nearby = []
+    for venue in venues:
+        distance = haversine_km(latitude, longitude, float(venue.latitude), float(venue.longitude))
+        if distance <= radius_km:
+            nearby.append((distance, venue))
+    nearby.sort(key=lambda pair: pair[0])
+
+    return [
+        {**_venue_to_dict(venue), 'distance_km': round(distance, 3)}
+        for distance, venue in nearby[:limit]
+    ]
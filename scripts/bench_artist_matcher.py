@@ -0,0 +1,90 @@
+# scripts/bench_artist_matcher.py
+"""
+Benchmark trigram-index fuzzy artist matching against a brute-force scan
+over every artist, on synthetic names with injected typos.
+Run with: python -m scripts.bench_artist_matcher --artists 100000
+"""
+import argparse
+import random
+import statistics
+import string
+import time
+from data_processing.transform.artist_matcher import ArtistMatcher, trigrams
+from data_processing.transform.utils import normalize_artist_name
+from utils.config import ARTIST_MATCH_THRESHOLD
+
+# Consonant-vowel(-consonant) syllables give a realistic spread of trigrams
+SYLLABLES = [c + v + tail for c in 'bcdfghjklmnprstvwz' for v in 'aeiou' for tail in ('', 'n', 'r', 's')]
+
+def synthetic_names(count: int, rng: random.Random):
+    names = set()
+    while len(names) < count:
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        name = ' '.join(word.capitalize() for word in words)
+        if rng.random() < 0.1:
+            name = f"The {name}"
+        names.add(name)
+    return sorted(names)
+
+def with_typo(name: str, rng: random.Random) -> str:
+    """One substitution, deletion or accent, like a hand-typed lineup"""
+    position = rng.randrange(len(name))
+    kind = rng.choice(['substitute', 'delete', 'accent'])
+    if kind == 'substitute':
+        return name[:position] + rng.choice(string.ascii_lowercase) + name[position + 1:]
+    if kind == 'delete' and len(name) > 4:
+        return name[:position] + name[position + 1:]
+    return name.replace('e', 'é', 1)
+
+def brute_force(artists, query: str, threshold: float):
+    """Baseline: score the query against every artist"""
+    query_grams = trigrams(normalize_artist_name(query))
+    best = None
+    for artist_id, grams in artists:
+        score = 2 * len(query_grams & grams) / (len(query_grams) + len(grams))
+        if score >= threshold and (best is None or score > best[0]):
+            best = (score, artist_id)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--artists', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--brute-queries', type=int, default=50)
+    parser.add_argument('--threshold', type=float, default=ARTIST_MATCH_THRESHOLD)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    names = synthetic_names(args.artists, rng)
+    artists = [(f"artist{i}", name, rng.randint(0, 100)) for i, name in enumerate(names)]
+
+    start = time.perf_counter()
+    matcher = ArtistMatcher(artists, threshold=args.threshold)
+    print(f"Indexed {len(matcher)} artists ({len(matcher.postings)} trigrams) in {time.perf_counter() - start:.2f}s")
+
+    sample = rng.sample(artists, args.queries)
+    queries = [(artist_id, with_typo(name, rng)) for artist_id, name, _ in sample]
+
+    timings, hits = [], 0
+    for expected_id, query in queries:
+        start = time.perf_counter()
+        match = matcher.match(query)
+        timings.append((time.perf_counter() - start) * 1000)
+        hits += bool(match and match['artist_id'] == expected_id)
+    timings.sort()
+    print(f"index:  median {statistics.median(timings):.3f}ms  p95 {timings[int(len(timings) * 0.95)]:.3f}ms  "
+          f"recall {hits / len(queries):.1%}")
+
+    gram_sets = [(artist_id, trigrams(normalize_artist_name(name))) for artist_id, name, _ in artists]
+    brute_timings = []
+    for _, query in queries[:args.brute_queries]:
+        start = time.perf_counter()
+        expected = brute_force(gram_sets, query, args.threshold)
+        brute_timings.append((time.perf_counter() - start) * 1000)
+        # The index must find the same best score as the exhaustive scan
+        candidates = matcher.candidates(query, limit=1)
+        assert (round(expected[0], 4) if expected else None) == (candidates[0]['score'] if candidates else None)
+    print(f"brute:  median {statistics.median(brute_timings):.3f}ms  (best scores agree on {len(brute_timings)} queries)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# scripts/bench_columnar_transform.py
+"""
+Compare the row-based transform and load (transform_all_data +
+load_spotify_data) against the columnar path (transform_all_data_columnar +
+load_spotify_frames) on a synthetic payload, checking both store the same rows.
+Run with: python -m scripts.bench_columnar_transform --plays 200000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict
+from sqlalchemy import text
+from data_processing.load.db_loader import DatabaseLoader
+from data_processing.transform.spotify_transform import SpotifyDataTransformer
+
+TABLES = ('artists', 'top_tracks', 'top_artists', 'listening_history')
+
+def full_artist(i: int) -> Dict:
+    return {
+        'id': f"artist{i:07d}", 'name': f"Artist {i}", 'genres': ['indie', 'rock'], 'popularity': i % 100,
+        'followers': {'total': i * 10}, 'external_urls': {'spotify': f"https://open.spotify.com/artist/{i}"},
+        'images': [{'url': f"https://i.scdn.co/image/{i}", 'height': 640, 'width': 640}]
+    }
+
+def simplified_artist(i: int) -> Dict:
+    return {'id': f"artist{i:07d}", 'name': f"Artist {i}",
+            'external_urls': {'spotify': f"https://open.spotify.com/artist/{i}"}}
+
+def synthetic_payload(plays: int, artists: int) -> Dict:
+    """extract_all_data-shaped raw data: 50 top tracks and artists, hydrated artists, plays"""
+    top_tracks = [
+        {'id': f"top{i}", 'name': f"Top {i}", 'artists': [simplified_artist(i)],
+         'album': {'id': f"album{i}", 'name': f"Album {i}"}, 'popularity': 50, 'duration_ms': 200000,
+         'explicit': False}
+        for i in range(50)
+    ]
+    return {
+        'top_tracks': top_tracks,
+        'top_artists': [full_artist(i) for i in range(50)],
+        'artists': [full_artist(i) for i in range(50, 500)],
+        'recently_played': [
+            {'played_at': f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{i % 60:02d}.{i % 1000:03d}Z",
+             'track': {'id': f"track{i:09d}", 'name': f"Track {i}", 'artists': [simplified_artist(i % artists)]}}
+            for i in range(plays)
+        ]
+    }
+
+def median_seconds(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def table_counts(loader: DatabaseLoader) -> Dict[str, int]:
+    with loader.engine.connect() as connection:
+        return {table: connection.execute(text(f"SELECT count(*) FROM {table}")).scalar() for table in TABLES}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--plays', type=int, default=200000)
+    parser.add_argument('--artists', type=int, default=5000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    raw_data = synthetic_payload(args.plays, args.artists)
+    transformer = SpotifyDataTransformer()
+    print(f"{args.plays:,} plays over {args.artists:,} artists, median of {args.repeats} runs")
+
+    rows_seconds = median_seconds(lambda: transformer.transform_all_data(raw_data), args.repeats)
+    columnar_seconds = median_seconds(lambda: transformer.transform_all_data_columnar(raw_data), args.repeats)
+    print(f"transform  rows {rows_seconds:6.3f}s  columnar {columnar_seconds:6.3f}s")
+
+    directory = tempfile.mkdtemp()
+    rows_loader = DatabaseLoader(db_url=f"sqlite:///{os.path.join(directory, 'rows.db')}")
+    columnar_loader = DatabaseLoader(db_url=f"sqlite:///{os.path.join(directory, 'columnar.db')}")
+    transformed = transformer.transform_all_data(raw_data)
+    frames = transformer.transform_all_data_columnar(raw_data)
+
+    start = time.perf_counter()
+    rows_loader.load_spotify_data(transformed)
+    rows_load = time.perf_counter() - start
+    start = time.perf_counter()
+    columnar_loader.load_spotify_frames(frames)
+    columnar_load = time.perf_counter() - start
+    print(f"load       rows {rows_load:6.3f}s  columnar {columnar_load:6.3f}s")
+
+    rows_counts, columnar_counts = table_counts(rows_loader), table_counts(columnar_loader)
+    assert rows_counts == columnar_counts, (rows_counts, columnar_counts)
+    print(f"Both paths stored {rows_counts}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# scripts/bench_extraction.py
+"""
+Benchmark extract_all_data against the local fake Spotify server, comparing
+sequential and concurrent modes. Run with: python -m scripts.bench_extraction
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from data_processing.extract.auth import SpotifyAuth
+from data_processing.extract.rate_limiter import RequestScheduler, TokenBucket
+from data_processing.extract.spotify_extract import SpotifyDataExtractor
+from scripts.fake_spotify_server import FakeSpotifyServer
+
+def build_extractor(server: FakeSpotifyServer, rate: float) -> SpotifyDataExtractor:
+    """Extractor wired to the fake server with an in-memory token"""
+    auth = SpotifyAuth(client_id='fake', client_secret='fake', accounts_url=server.base_url)
+    auth.access_token = 'fake-access-token'
+    auth.token_expires = datetime.now() + timedelta(hours=1)
+
+    extractor = SpotifyDataExtractor(auth=auth, base_url=server.api_url)
+    extractor.scheduler = RequestScheduler(TokenBucket(rate, int(rate)), backoff_base=0.05)
+    return extractor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--rate', type=float, default=1000, help='Client-side requests per second')
+    parser.add_argument('--rate-limit-every', type=int, default=0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8])
+    args = parser.parse_args()
+
+    server = FakeSpotifyServer(
+        latency=args.latency, pages=args.pages, rate_limit_every=args.rate_limit_every, retry_after=0
+    ).start()
+
+    try:
+        runs = [('sequential', None)] + [('concurrent', workers) for workers in args.workers]
+        for mode, workers in runs:
+            extractor = build_extractor(server, args.rate)
+            requests_before = server.requests
+            start = time.perf_counter()
+            data = extractor.extract_all_data(mode=mode, max_workers=workers)
+            elapsed = time.perf_counter() - start
+
+            calls = server.requests - requests_before
+            items = sum(len(value) for value in data.values() if isinstance(value, list))
+            label = mode if workers is None else f"{mode} x{workers}"
+            print(f"{label:<16} {elapsed:6.2f}s  {calls:4d} requests  {calls / elapsed:7.1f} req/s  "
+                  f"{items} items  {extractor.scheduler.get_stats()}")
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# scripts/bench_http_client.py
+"""
+Micro-benchmark: bare requests.get vs the pooled HttpClient against a local
+stand-in HTTP server. Run with: python -m scripts.bench_http_client
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import requests
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from data_processing.extract.http_client import HttpClient
+
+PAYLOAD = json.dumps({'items': [{'id': str(i), 'name': f'Track {i}'} for i in range(50)]}).encode('utf-8')
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Keep-alive capable handler returning a fixed JSON payload"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        return
+
+def time_requests(send, url: str, n: int) -> list:
+    """Return per-request latencies in milliseconds"""
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = send(url)
+        response.raise_for_status()
+        response.json()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def summarize(label: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<18} mean={statistics.mean(latencies):7.3f}ms "
+          f"p50={statistics.median(latencies):7.3f}ms p95={p95:7.3f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/me"
+
+    client = HttpClient()
+    try:
+        summarize('requests.get', time_requests(lambda u: requests.get(u, timeout=10), url, args.requests))
+        summarize('pooled HttpClient', time_requests(client.get, url, args.requests))
+    finally:
+        client.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
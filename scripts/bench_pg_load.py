@@ -0,0 +1,96 @@
+# scripts/bench_pg_load.py
+"""
+Compare DatabaseLoader throughput on SQLite against PostgreSQL, with the
+PostgreSQL path run both as multi-VALUES upserts and as COPY into a staging
+table followed by a set-based merge. Each backend loads the same plays and
+artists twice; the second pass must insert nothing.
+The PostgreSQL runs use a scratch schema (bench_load) that is dropped and
+recreated, so point --pg-url at a local development database.
+Run with: python -m scripts.bench_pg_load --pg-url postgresql+psycopg2://localhost/music_dashboard
+"""
+import argparse
+import math
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from urllib.parse import quote
+from sqlalchemy import create_engine, text
+from data_processing.load.db_loader import DatabaseLoader
+
+BENCH_SCHEMA = 'bench_load'
+
+def artist_rows(count: int):
+    now = datetime(2024, 1, 1)
+    return [
+        {'id': f"artist{i}", 'name': f"Artist {i}", 'genre': 'indie', 'popularity': i % 100,
+         'followers': i * 10, 'spotify_url': f"https://open.spotify.com/artist/{i}", 'image_url': None,
+         'created_at': now, 'updated_at': now}
+        for i in range(count)
+    ]
+
+def play_rows(count: int, artists: int):
+    base = datetime(2024, 1, 1)
+    return [
+        {'track_id': f"track{i % 20000}", 'track_name': f"Track\t{i % 20000}", 'artist_id': f"artist{i % artists}",
+         'artist_name': f"Artist {i % artists}", 'played_at': base + timedelta(seconds=i),
+         'extracted_at': base, 'created_at': base}
+        for i in range(count)
+    ]
+
+def scratch_schema_url(pg_url: str) -> str:
+    """Recreate the scratch schema and return a URL whose connections use it"""
+    admin = create_engine(pg_url)
+    with admin.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        connection.execute(text(f"CREATE SCHEMA {BENCH_SCHEMA}"))
+    admin.dispose()
+    separator = '&' if '?' in pg_url else '?'
+    return f"{pg_url}{separator}options={quote(f'-csearch_path={BENCH_SCHEMA}')}"
+
+def run_backend(db_url: str, artists, plays, batch: int, copy_min_rows: float) -> dict:
+    loader = DatabaseLoader(db_url=db_url)
+    loader.copy_min_rows = copy_min_rows
+
+    passes = []
+    for _ in range(2):
+        start = time.perf_counter()
+        loaded = 0
+        for offset in range(0, len(plays), batch):
+            stats = loader.load_spotify_data({
+                'artists': artists if offset == 0 else [],
+                'listening_history': plays[offset:offset + batch]
+            })
+            loaded += stats.get('listening_history', 0)
+        passes.append((time.perf_counter() - start, loaded))
+
+    with loader.engine.connect() as connection:
+        stored = connection.execute(text("SELECT count(*) FROM listening_history")).scalar()
+    loader.engine.dispose()
+    return {'first': passes[0], 'second': passes[1], 'stored': stored}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pg-url', default=os.getenv('PG_BENCH_URL'))
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--artists', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=5000, help="rows per loader call (one transaction)")
+    args = parser.parse_args()
+
+    artists, plays = artist_rows(args.artists), play_rows(args.rows, args.artists)
+    backends = [('sqlite', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_load.db')}", math.inf)]
+    if args.pg_url:
+        backends += [('postgres values', None, math.inf), ('postgres copy', None, 0)]
+    else:
+        print("No --pg-url or PG_BENCH_URL given; running the SQLite baseline only")
+
+    print(f"Loading {args.artists:,} artists and {args.rows:,} plays in {args.batch:,}-row batches, twice")
+    for name, db_url, copy_min_rows in backends:
+        result = run_backend(db_url or scratch_schema_url(args.pg_url), artists, plays, args.batch, copy_min_rows)
+        (first_seconds, first_loaded), (second_seconds, second_loaded) = result['first'], result['second']
+        assert first_loaded == args.rows and second_loaded == 0 and result['stored'] == args.rows, result
+        print(f"{name:16s} load {first_seconds:6.2f}s ({args.rows / first_seconds:9,.0f} rows/s)  "
+              f"reload {second_seconds:6.2f}s ({args.rows / second_seconds:9,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# scripts/bench_spatial.py
+"""
+Benchmark geohash-indexed venue queries against a full-table scan with
+Python-side distance math, on synthetic venues in a throwaway SQLite file.
+Run with: python -m scripts.bench_spatial --venues 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from database.db import Base
+from database.geohash import haversine_km
+from database.models import MusicVenue
+from database.spatial import venues_in_bbox, venues_within_radius
+
+def seed_venues(session, count: int) -> None:
+    """Scatter venues over the continental US"""
+    rng = random.Random(42)
+    venues = [
+        {
+            'name': f"Venue {i}",
+            'location': f"{i} Main St",
+            'latitude': rng.uniform(25.0, 49.0),
+            'longitude': rng.uniform(-124.0, -67.0)
+        }
+        for i in range(count)
+    ]
+    session.bulk_insert_mappings(MusicVenue, venues)
+    session.commit()
+
+def full_scan_radius(session, latitude: float, longitude: float, radius_km: float):
+    """Baseline: load every venue and filter in Python"""
+    rows = session.query(MusicVenue.id, MusicVenue.latitude, MusicVenue.longitude).all()
+    nearby = [
+        (haversine_km(latitude, longitude, float(lat), float(lon)), venue_id)
+        for venue_id, lat, lon in rows
+    ]
+    return sorted(pair for pair in nearby if pair[0] <= radius_km)
+
+def timed(fn, runs: int) -> float:
+    """Median wall time in milliseconds"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--venues', type=int, default=50000)
+    parser.add_argument('--radius', type=float, default=25.0, help='Radius in km')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench_spatial.db')
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    start = time.perf_counter()
+    seed_venues(session, args.venues)
+    print(f"Seeded {args.venues} venues in {time.perf_counter() - start:.2f}s")
+
+    plan = session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM music_venues WHERE geohash >= 'dhv' AND geohash < 'dhv~'"
+    )).fetchall()
+    print(f"Query plan: {plan[-1][-1]}")
+
+    lat, lon = 28.5384, -81.3789  # Orlando
+    indexed = venues_within_radius(session, lat, lon, args.radius)
+    baseline = full_scan_radius(session, lat, lon, args.radius)
+    assert [venue['id'] for venue in indexed] == [venue_id for _, venue_id in baseline]
+    print(f"{len(indexed)} venues within {args.radius}km")
+
+    print(f"radius (geohash index): {timed(lambda: venues_within_radius(session, lat, lon, args.radius), args.runs):8.2f}ms")
+    print(f"radius (full scan):     {timed(lambda: full_scan_radius(session, lat, lon, args.radius), args.runs):8.2f}ms")
+    print(f"bbox viewport (index):  "
+          f"{timed(lambda: venues_in_bbox(session, 28.0, -82.0, 29.0, -81.0), args.runs):8.2f}ms")
+
+    session.close()
+    engine.dispose()
+    os.remove(db_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# scripts/bench_sqlite_profile.py
+"""
+Benchmark dashboard-style reads running concurrently with a bulk
+listening-history load, using default SQLAlchemy engines (rollback
+journal, synchronous=FULL) versus the tuned profile from database.engine
+(WAL, pragmas, separate writer and read-only pools).
+Run with: python -m scripts.bench_sqlite_profile --rows 200000 --readers 4
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from database.db import Base
+from database.engine import create_db_engine
+from database.models import ListeningHistory
+
+# Recent-plays panel: cheap on its own, so any latency is lock waiting
+DASHBOARD_QUERY = text(
+    "SELECT track_name, artist_name, played_at FROM listening_history ORDER BY id DESC LIMIT 50"
+)
+
+def play_rows(start: int, count: int):
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            'track_id': f"track{i % 5000}",
+            'track_name': f"Track {i % 5000}",
+            'artist_id': None,
+            'artist_name': f"Artist {i % 300}",
+            'played_at': base + timedelta(seconds=i),
+            'extracted_at': base,
+            'created_at': base
+        }
+        for i in range(start, start + count)
+    ]
+
+def read_loop(profile: str, url: str, done, results) -> None:
+    """Dashboard process: run the panel query until the load finishes"""
+    reader = create_db_engine(url, read_only=True) if profile == 'tuned' else create_engine(url)
+    latencies, errors = [], 0
+    while not done.is_set():
+        start = time.perf_counter()
+        try:
+            with reader.connect() as connection:
+                connection.execute(DASHBOARD_QUERY).fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+        except OperationalError:
+            errors += 1
+    reader.dispose()
+    results.put((latencies, errors))
+
+def run_profile(profile: str, rows: int, chunk: int, readers: int) -> dict:
+    db_path = os.path.join(tempfile.mkdtemp(), f'bench_{profile}.db')
+    url = f"sqlite:///{db_path}"
+    writer = create_db_engine(url) if profile == 'tuned' else create_engine(url)
+    Base.metadata.create_all(bind=writer)
+    with writer.begin() as connection:
+        connection.execute(ListeningHistory.__table__.insert(), play_rows(0, chunk))
+
+    done, results = multiprocessing.Event(), multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=read_loop, args=(profile, url, done, results), daemon=True)
+        for _ in range(readers)
+    ]
+    for process in processes:
+        process.start()
+    time.sleep(0.5)  # Let the readers connect
+
+    load_start = time.perf_counter()
+    for start in range(chunk, rows, chunk):
+        # One transaction per chunk, like the loader's per-batch commits
+        with writer.begin() as connection:
+            connection.execute(ListeningHistory.__table__.insert(), play_rows(start, min(chunk, rows - start)))
+    load_seconds = time.perf_counter() - load_start
+
+    done.set()
+    latencies, errors = [], 0
+    for _ in processes:
+        process_latencies, process_errors = results.get()
+        latencies.extend(process_latencies)
+        errors += process_errors
+    for process in processes:
+        process.join()
+    writer.dispose()
+
+    latencies.sort()
+    return {
+        'load_seconds': load_seconds,
+        'reads': len(latencies),
+        'errors': errors,
+        'median_ms': statistics.median(latencies) if latencies else float('nan'),
+        'p99_ms': latencies[int(len(latencies) * 0.99)] if latencies else float('nan'),
+        'max_ms': latencies[-1] if latencies else float('nan')
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--chunk', type=int, default=2000)
+    parser.add_argument('--readers', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"Loading {args.rows:,} plays in {args.chunk:,}-row commits with {args.readers} concurrent reader processes")
+    for profile in ('default', 'tuned'):
+        result = run_profile(profile, args.rows, args.chunk, args.readers)
+        print(f"{profile:8s} load {result['load_seconds']:6.2f}s  reads {result['reads']:6d}  "
+              f"errors {result['errors']:4d}  read median {result['median_ms']:7.2f}ms  "
+              f"p99 {result['p99_ms']:8.2f}ms  max {result['max_ms']:8.2f}ms")
+
+if __name__ == "__main__":
+    main()
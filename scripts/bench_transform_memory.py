@@ -0,0 +1,109 @@
+# scripts/bench_transform_memory.py
+"""
+Compare peak RSS of holding a synthetic play stream as plain dicts (raw
+artist payloads in the artist map, dict rows for plays) versus the slotted
+records in data_processing.transform.records. Each variant runs in its own
+subprocess so peak RSS is not shared.
+Run with: python -m scripts.bench_transform_memory --plays 1000000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterator
+from data_processing.transform.records import PlayRecord
+from data_processing.transform.spotify_transform import SpotifyDataTransformer
+
+def synthetic_plays(count: int, artists: int) -> Iterator[Dict]:
+    """Recently-played shaped items (simplified artists), built lazily like a streaming parse"""
+    for i in range(count):
+        artist_id = f"artist{i % artists:07d}"
+        artist = {
+            'id': artist_id,
+            'name': f"Artist {i % artists}",
+            'type': 'artist',
+            'uri': f"spotify:artist:{artist_id}",
+            'href': f"https://api.spotify.com/v1/artists/{artist_id}",
+            'external_urls': {'spotify': f"https://open.spotify.com/artist/{artist_id}"}
+        }
+        yield {
+            'played_at': f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{i % 60:02d}.000Z",
+            'track': {'id': f"track{i:09d}", 'name': f"Track {i}", 'artists': [artist]}
+        }
+
+def hold_dicts(plays: Iterator[Dict], execution_date: datetime):
+    """The previous shape: raw artist objects merged in place per id, one dict row per play"""
+    artists_map, rows = {}, []
+    for item in plays:
+        track = item['track']
+        for artist in track['artists']:
+            existing = artists_map.get(artist['id'])
+            if existing is None:
+                artists_map[artist['id']] = artist
+                continue
+            for key, value in artist.items():
+                if value is not None and (existing.get(key) is None or key == 'popularity'):
+                    existing[key] = value
+        primary_artist = track['artists'][0]
+        rows.append({
+            'track_id': track['id'],
+            'track_name': track['name'],
+            'artist_id': primary_artist['id'],
+            'artist_name': primary_artist['name'],
+            'played_at': datetime.fromisoformat(item['played_at'].replace('Z', '+00:00')),
+            'extracted_at': execution_date,
+            'created_at': execution_date
+        })
+    return artists_map, rows
+
+def hold_records(plays: Iterator[Dict], execution_date: datetime):
+    """Slotted records through the transformer's own artist merge"""
+    transformer = SpotifyDataTransformer()
+    artists_map, records = {}, []
+    for item in plays:
+        for artist in item['track']['artists']:
+            transformer._add_artist_to_map(artists_map, artist)
+        records.append(PlayRecord.from_api(item))
+    return artists_map, records
+
+def run_variant(variant: str, plays: int, artists: int) -> Dict:
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    hold = hold_dicts if variant == 'dicts' else hold_records
+    artists_map, held = hold(synthetic_plays(plays, artists), datetime.now())
+    return {
+        'variant': variant,
+        'seconds': round(time.perf_counter() - start, 2),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'delta_rss_mb': round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb) / 1024, 1),
+        'artists': len(artists_map),
+        'plays': len(held)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--plays', type=int, default=1_000_000)
+    parser.add_argument('--artists', type=int, default=50_000)
+    parser.add_argument('--variant', choices=['dicts', 'records'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.plays, args.artists)))
+        return
+
+    print(f"{args.plays:,} plays over {args.artists:,} artists")
+    for variant in ('dicts', 'records'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'scripts.bench_transform_memory', '--variant', variant,
+             '--plays', str(args.plays), '--artists', str(args.artists)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{variant:8s} peak RSS {result['peak_rss_mb']:8.1f}MB "
+              f"(+{result['delta_rss_mb']:.1f}MB held)  {result['seconds']:6.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# scripts/check_query_plans.py
+"""
+Build a scratch SQLite database through the migration runner and assert,
+via EXPLAIN QUERY PLAN, that the dashboard's hot queries use an index
+rather than scanning the table. Exits non-zero on the first regression.
+Run with: python -m scripts.check_query_plans
+"""
+import os
+import sys
+import tempfile
+from sqlalchemy import text
+from database.engine import create_db_engine
+from database.migrations import run_migrations
+
+# (description, query, index the plan must mention)
+HOT_QUERIES = [
+    ("recent plays in a date range",
+     "SELECT track_name, played_at FROM listening_history "
+     "WHERE played_at >= '2024-01-01' AND played_at < '2024-02-01' ORDER BY played_at DESC",
+     'ix_listening_history_played_at'),
+    ("plays for one artist",
+     "SELECT played_at FROM listening_history WHERE artist_id = 'a1'",
+     'ix_listening_history_artist_id'),
+    ("latest top tracks for a time range",
+     "SELECT name, rank FROM top_tracks WHERE extracted_date = '2024-01-01' AND time_range = 'short_term' ORDER BY rank",
+     'uq_top_tracks_ranking'),
+    ("latest top artists for a time range",
+     "SELECT artist_id, rank FROM top_artists WHERE extracted_date = '2024-01-01' AND time_range = 'short_term' ORDER BY rank",
+     'uq_top_artists_ranking'),
+    ("top tracks for one artist",
+     "SELECT name FROM top_tracks WHERE artist_id = 'a1'",
+     'ix_top_tracks_artist_id'),
+    ("upcoming shows",
+     "SELECT event, date FROM show_events WHERE date >= '2024-06-01' ORDER BY date",
+     'ix_show_events_date'),
+    ("shows at a venue",
+     "SELECT event FROM show_events WHERE venue_id = 1",
+     'ix_show_events_venue_id'),
+    ("lineup of a show",
+     "SELECT artist_id FROM show_artists WHERE show_id = 1",
+     'ix_show_artists_show_id'),
+    ("shows for an artist",
+     "SELECT show_id FROM show_artists WHERE artist_id = 'a1'",
+     'ix_show_artists_artist_id'),
+    ("venues in a geohash cell",
+     "SELECT id FROM music_venues WHERE geohash >= 'gcpv' AND geohash < 'gcpw'",
+     'ix_music_venues_geohash'),
+    ("artist lookup by normalized name",
+     "SELECT id FROM artists WHERE normalized_name IN ('radiohead', 'bjork')",
+     'ix_artists_normalized_name'),
+]
+
+def query_plan(connection, query: str) -> str:
+    return ' | '.join(row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {query}")))
+
+def main() -> int:
+    db_path = os.path.join(tempfile.mkdtemp(), 'query_plans.db')
+    engine = create_db_engine(f"sqlite:///{db_path}")
+    run_migrations(engine)
+
+    failures = 0
+    with engine.connect() as connection:
+        # Planner statistics so index choice doesn't depend on an empty table
+        connection.execute(text("ANALYZE"))
+        for description, query, index_name in HOT_QUERIES:
+            plan = query_plan(connection, query)
+            ok = index_name in plan
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {description}: {plan}")
+    engine.dispose()
+
+    print(f"{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot queries use their index")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
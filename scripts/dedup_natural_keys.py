@@ -0,0 +1,12 @@
+# scripts/dedup_natural_keys.py
+"""
+Remove duplicate plays and rankings left by earlier overlapping runs and
+add the natural-key unique indexes to an existing database.
+Run with: python -m scripts.dedup_natural_keys
+"""
+from database.db import engine
+from database.dedup import dedup_natural_keys
+
+if __name__ == "__main__":
+    for table, count in dedup_natural_keys(engine).items():
+        print(f"{table}: removed {count} duplicate rows")
@@ -0,0 +1,298 @@
+# scripts/fake_spotify_server.py
+"""
+Local stand-in for the Spotify Web API and accounts service.
+
+Serves deterministic fixtures for /me, /me/top/*, /me/player/recently-played,
+/me/tracks, /search, /artists and the token endpoint, with configurable
+latency, page counts, 429 injection and payload size. Point the extractor at
+it with SPOTIFY_API_BASE_URL / SPOTIFY_ACCOUNTS_URL (printed on start).
+
+Run with: python -m scripts.fake_spotify_server --port 8900 --latency 0.05
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, urlencode
+
+class FakeSpotifyHandler(BaseHTTPRequestHandler):
+    """Routes requests to the fixtures held by FakeSpotifyServer"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        return
+
+    def _send_json(self, code: int, body: dict = None, headers: dict = None) -> None:
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        fake: FakeSpotifyServer = self.server.fake
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+
+        if urlparse(self.path).path != '/api/token':
+            return self._send_json(404, {'error': 'not found'})
+        fake.count_request()
+        fake.sleep()
+        self._send_json(200, {
+            'access_token': f"fake-access-{time.time_ns()}",
+            'token_type': 'Bearer',
+            'expires_in': fake.token_expires_in,
+            'refresh_token': 'fake-refresh-token'
+        })
+
+    def do_GET(self):
+        fake: FakeSpotifyServer = self.server.fake
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        request_number = fake.count_request()
+        fake.sleep()
+
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self._send_json(401, {'error': {'status': 401, 'message': 'No token provided'}})
+
+        if fake.rate_limit_every and request_number % fake.rate_limit_every == 0:
+            fake.throttled += 1
+            return self._send_json(
+                429,
+                {'error': {'status': 429, 'message': 'API rate limit exceeded'}},
+                {'Retry-After': str(fake.retry_after)}
+            )
+
+        route = parsed.path[len('/v1'):] if parsed.path.startswith('/v1') else None
+        try:
+            body = fake.route(route, params)
+        except ValueError as e:
+            return self._send_json(400, {'error': {'status': 400, 'message': str(e)}})
+        if body is None:
+            return self._send_json(404, {'error': {'status': 404, 'message': 'Service not found'}})
+
+        # Conditional requests, so the response cache can be exercised
+        etag = '"' + hashlib.md5(json.dumps(body, sort_keys=True).encode('utf-8')).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._send_json(304, None, {'ETag': etag})
+        self._send_json(200, body, {'ETag': etag})
+
+
+class FakeSpotifyServer:
+    """Deterministic fake of the Spotify endpoints the extractor uses"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 pages: int = 3, page_size: int = 50, rate_limit_every: int = 0,
+                 retry_after: int = 1, padding: int = 0, token_expires_in: int = 3600):
+        self.latency = latency
+        self.pages = pages
+        self.page_size = page_size
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.padding = 'x' * padding
+        self.token_expires_in = token_expires_in
+        self.total_items = pages * page_size
+
+        self.requests = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+
+        self.httpd = ThreadingHTTPServer((host, port), FakeSpotifyHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    def start(self) -> 'FakeSpotifyServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def count_request(self) -> int:
+        with self.lock:
+            self.requests += 1
+            return self.requests
+
+    def sleep(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    # Fixtures
+
+    def artist(self, index: int, full: bool = True) -> dict:
+        artist = {
+            'id': f"artist{index:06d}",
+            'name': f"Fake Artist {index}",
+            'type': 'artist',
+            'external_urls': {'spotify': f"https://open.spotify.com/artist/artist{index:06d}"}
+        }
+        if full:
+            artist.update({
+                'genres': ['rock', 'metal'] if index % 2 else ['pop'],
+                'popularity': index % 100,
+                'followers': {'total': index * 1000},
+                'images': [{'url': f"https://i.scdn.co/image/{index}", 'height': 320, 'width': 320}]
+            })
+        return artist
+
+    def track(self, index: int) -> dict:
+        track = {
+            'id': f"track{index:06d}",
+            'name': f"Fake Track {index}",
+            'artists': [self.artist(index % 500, full=False)],
+            'album': {'id': f"album{index // 10:06d}", 'name': f"Fake Album {index // 10}"},
+            'popularity': index % 100,
+            'duration_ms': 180000 + index,
+            'explicit': index % 7 == 0
+        }
+        if self.padding:
+            track['padding'] = self.padding
+        return track
+
+    def played_at(self, index: int) -> datetime:
+        """Play 0 is the most recent, one play every three minutes before it"""
+        return self.now - timedelta(minutes=3 * index)
+
+    def _offset_page(self, path: str, params: dict, make_item) -> dict:
+        limit = min(int(params.get('limit', 20)), 50)
+        offset = int(params.get('offset', 0))
+        end = min(offset + limit, self.total_items)
+        next_params = {**params, 'offset': end, 'limit': limit}
+        return {
+            'href': f"{self.api_url}{path}?{urlencode(params)}",
+            'items': [make_item(i) for i in range(offset, end)],
+            'limit': limit,
+            'offset': offset,
+            'total': self.total_items,
+            'next': f"{self.api_url}{path}?{urlencode(next_params)}" if end < self.total_items else None,
+            'previous': None
+        }
+
+    def _recently_played(self, params: dict) -> dict:
+        limit = min(int(params.get('limit', 20)), 50)
+        stamps = [int(self.played_at(i).timestamp() * 1000) for i in range(self.total_items)]
+
+        if 'after' in params:
+            # Oldest plays newer than the cursor, returned newest first
+            newer = [i for i, ms in enumerate(stamps) if ms > int(params['after'])]
+            indexes = sorted(newer, reverse=True)[:limit][::-1]
+            has_more = len(newer) > limit
+        else:
+            before = int(params['before']) if 'before' in params else None
+            older = [i for i, ms in enumerate(stamps) if before is None or ms < before]
+            indexes = older[:limit]
+            has_more = len(older) > limit
+
+        items = [
+            {
+                'track': self.track(i),
+                'played_at': self.played_at(i).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                'context': None
+            }
+            for i in indexes
+        ]
+        cursors = {'after': str(stamps[indexes[0]]), 'before': str(stamps[indexes[-1]])} if indexes else None
+
+        next_url = None
+        if has_more and indexes:
+            key = 'after' if 'after' in params else 'before'
+            next_params = {'limit': limit, key: cursors[key]}
+            next_url = f"{self.api_url}/me/player/recently-played?{urlencode(next_params)}"
+        return {'items': items, 'next': next_url, 'cursors': cursors, 'limit': limit}
+
+    def _search(self, params: dict) -> dict:
+        query = params.get('q', '')
+        name_hash = int(hashlib.md5(query.lower().encode('utf-8')).hexdigest()[:6], 16)
+        artist = self.artist(name_hash)
+        artist.update({'id': f"search{name_hash:08d}", 'name': query})
+        return {'artists': {
+            'href': f"{self.api_url}/search?{urlencode(params)}",
+            'items': [artist, self.artist(name_hash + 1)],
+            'limit': int(params.get('limit', 10)),
+            'offset': 0,
+            'total': 2,
+            'next': None,
+            'previous': None
+        }}
+
+    def _artists(self, params: dict) -> dict:
+        ids = [artist_id for artist_id in params.get('ids', '').split(',') if artist_id]
+        if len(ids) > 50:
+            raise ValueError('Too many ids requested')
+        artists = []
+        for artist_id in ids:
+            if artist_id.startswith('artist') and artist_id[6:].isdigit():
+                artists.append(self.artist(int(artist_id[6:])))
+            else:
+                artists.append(None)
+        return {'artists': artists}
+
+    def route(self, path: str, params: dict):
+        """Return the JSON body for an API path, or None for unknown paths"""
+        if path == '/me':
+            return {'id': 'fake_user', 'display_name': 'Fake User', 'country': 'US',
+                    'followers': {'total': 0}, 'product': 'premium'}
+        if path == '/me/top/tracks':
+            return self._offset_page(path, params, self.track)
+        if path == '/me/top/artists':
+            return self._offset_page(path, params, self.artist)
+        if path == '/me/tracks':
+            return self._offset_page(path, params, lambda i: {
+                'added_at': self.played_at(i).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'track': self.track(i)
+            })
+        if path == '/me/player/recently-played':
+            return self._recently_played(params)
+        if path == '/search':
+            return self._search(params)
+        if path == '/artists':
+            return self._artists(params)
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local fake Spotify API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--pages', type=int, default=3, help='Pages per paged endpoint')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='Return 429 for every Nth request')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--padding', type=int, default=0, help='Extra bytes added to every track')
+    args = parser.parse_args()
+
+    server = FakeSpotifyServer(
+        host=args.host, port=args.port, latency=args.latency, pages=args.pages,
+        page_size=args.page_size, rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after, padding=args.padding
+    )
+    print(f"export SPOTIFY_API_BASE_URL={server.api_url}")
+    print(f"export SPOTIFY_ACCOUNTS_URL={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# scripts/import_streaming_history.py
+"""
+Import Spotify "Extended streaming history" exports into listening_history.
+Interrupted imports resume from the last completed file.
+Run with: python -m scripts.import_streaming_history path/to/export_dir
+"""
+import argparse
+from data_processing.load.db_loader import DatabaseLoader
+from data_processing.load.history_importer import StreamingHistoryImporter
+from utils.config import DB_URL, HISTORY_IMPORT_CHUNK_SIZE, HISTORY_IMPORT_WORKERS
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('export_dir', help='Directory holding Streaming_History_Audio_*.json files')
+    parser.add_argument('--workers', type=int, default=HISTORY_IMPORT_WORKERS)
+    parser.add_argument('--chunk-size', type=int, default=HISTORY_IMPORT_CHUNK_SIZE)
+    parser.add_argument('--state-file', default=None, help='Defaults to .import_state.json in export_dir')
+    args = parser.parse_args()
+
+    importer = StreamingHistoryImporter(
+        loader=DatabaseLoader(db_url=DB_URL),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        state_path=args.state_file
+    )
+    stats = importer.run(
+        args.export_dir,
+        on_file=lambda name, file_stats: print(
+            f"{name}: {file_stats['loaded']}/{file_stats['rows']} new plays "
+            f"({file_stats['rows_per_sec']:,.0f} rows/sec load)"
+        )
+    )
+    print(f"Imported {stats['loaded']} plays from {stats['files']} files "
+          f"({stats['duplicates']} duplicates skipped, {stats['rows_per_sec']:,.0f} rows/sec)")
+
+if __name__ == "__main__":
+    main()
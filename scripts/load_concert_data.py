@@ -5,8 +5,9 @@ from database.models import MusicVenue, ShowArtist, ShowEvent, Artist
 from database.db_manager import DatabaseManager
 from utils.config import ROOT_DIR
 from data_processing.extract.artist_extract import add_artist_not_in_db
-from data_processing.transform.utils import clean_artist_name
-from database.db_manager import DatabaseManager
+from data_processing.extract.artist_resolver import ArtistResolver
+from data_processing.transform.artist_matcher import ArtistMatcher
+from data_processing.transform.utils import clean_artist_name, normalize_artist_name
 from data_processing.transform.spotify_transform import SpotifyDataTransformer
 
 TEST_DATA_PATH = os.path.join(ROOT_DIR, 'storage', 'test_data')
@@ -76,37 +77,29 @@ def insert_show_artists(db):
 
 def process_show_artist_data(df):
     """Process show artist data from a DataFrame"""
-    df['cleaned_name'] = df['artist'].apply(clean_artist_name)
-    show_artists = df['cleaned_name'].unique().tolist()
-    
     db = DatabaseManager()
 
-    # existing_artist_list = get_existing_artist_names(db)
-    
-    # artists_to_fetch = list(set(show_artists) - set(existing_artist_list))
-
-    # for artist_name in artists_to_fetch:
-    #     name = artist_name.replace('_', ' ').title()
-    #     add_artist_not_in_db(name, db)
-
-    # # Fetch updated artist list from DB
-    # existing_artist_list = get_existing_artist_names(db)
-
-    # # Get the list of artists that don't have a match
-    # still_missing = list(set(show_artists) - set(existing_artist_list))
-    # still_missing_df = df[df['cleaned_name'].isin(still_missing)]
-    # for artist_name in still_missing_df['artist'].unique().tolist():
-    #     add_unmatched_artists(artist_name, db)
-
-    # Now map artist names to IDs
-    existing_artists = db.get_all(Artist)
-    existing_artists['cleaned_name'] = existing_artists['name'].apply(clean_artist_name)
-
-    df = df.merge(existing_artists[['id', 'cleaned_name']], on='cleaned_name', how='left', suffixes=('', '_db'))
+    # Map artist names to IDs through the normalized_name index
+    df['normalized_name'] = df['artist'].map(normalize_artist_name)
+    artist_ids = db.get_artist_ids_by_normalized_name(df['normalized_name'].unique())
+    df['artist_id'] = df['normalized_name'].map(artist_ids)
+
+    # Search Spotify for the rest in one batch; found artists are stored by the resolver
+    unmatched = df.loc[df['artist_id'].isna(), 'artist'].unique().tolist()
+    if unmatched:
+        resolved = ArtistResolver(db).resolve(unmatched)
+        resolved_ids = {name: artist_id for name, artist_id in resolved.items() if artist_id}
+        df['artist_id'] = df['artist_id'].fillna(df['artist'].map(resolved_ids))
+
+    # Fall back to fuzzy matching for names Spotify search didn't resolve
+    unmatched = df.loc[df['artist_id'].isna(), 'artist'].unique()
+    if len(unmatched):
+        matches = ArtistMatcher.from_db(db).match_many(unmatched)
+        fuzzy_ids = {name: match['artist_id'] for name, match in matches.items() if match}
+        df['artist_id'] = df['artist_id'].fillna(df['artist'].map(fuzzy_ids))
     df['is_headliner'] = df['is_headliner'].fillna(False).astype(bool)
 
-    df.rename(columns={'id': 'artist_id', 'show_id': 'show_id'}, inplace=True)
-    df.drop(columns=['artist', 'cleaned_name'], inplace=True)
+    df.drop(columns=['artist', 'normalized_name'], inplace=True)
 
     return df.to_dict(orient='records')
 
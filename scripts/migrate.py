@@ -0,0 +1,25 @@
+# scripts/migrate.py
+"""
+Apply pending schema migrations to the configured database.
+Run with: python -m scripts.migrate [--status]
+"""
+import argparse
+from database.db import engine
+from database.migrations import MIGRATIONS, applied_versions, run_migrations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--status', action='store_true', help="list migrations without applying them")
+    args = parser.parse_args()
+
+    if args.status:
+        done = set(applied_versions(engine))
+        for migration in MIGRATIONS:
+            print(f"{'applied' if migration.version in done else 'pending':8s} {migration.version:3d} {migration.name}")
+        return
+
+    applied = run_migrations(engine)
+    print(f"Applied migrations: {applied}" if applied else "Schema is up to date")
+
+if __name__ == "__main__":
+    main()
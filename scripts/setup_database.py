@@ -1,10 +1,11 @@
 ### create_tables.py ###
 from database.db import Base, engine  
 from database.models import *      
+from database.migrations import run_migrations
 
 def create_tables():
-    """Creates all database tables defined in models."""
-    Base.metadata.create_all(bind=engine)
+    """Creates all database tables defined in models and applies pending migrations."""
+    run_migrations(engine)
 
 if __name__ == "__main__":
     create_tables()  # Run directly when needed
\ No newline at end of file